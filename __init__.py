@@ -1,19 +1,84 @@
 from __future__ import annotations
+from datetime import timedelta
+import logging
+
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import slugify
 
-from .const import DOMAIN, REGISTER_LIST
+from .const import (
+    CONF_FORCE_WRITES,
+    CONF_MAX_IN_FLIGHT,
+    CONF_RECORD_TRAFFIC,
+    CONF_REGISTER_GROUPS,
+    CONF_SCAN_INTERVAL_MAX,
+    CONF_SCAN_INTERVAL_MIN,
+    CONF_TRANSPORT,
+    CONF_UNIT_ID,
+    DEFAULT_FORCE_WRITES,
+    DEFAULT_MAX_IN_FLIGHT,
+    DEFAULT_RECORD_TRAFFIC,
+    DEFAULT_SCAN_INTERVAL_MAX,
+    DEFAULT_SCAN_INTERVAL_MIN,
+    DEFAULT_UNIT_ID,
+    DOMAIN,
+    REGISTER_GROUPS,
+    REGISTER_LIST,
+    register_group,
+)
+from .address_map import AddressMap
 from .coordinator import ModbusCoordinator
+from .hub import ModbusHub, async_get_hub, async_release_hub
+from .planner import MAX_READ_COUNT
+from .recorder import CAPTURE_FILE, TrafficRecorder
+from .restore import SnapshotStore
+from .probe import (
+    TRANSPORT_MAX_READ_COUNT,
+    TRANSPORT_PIPELINING,
+    TRANSPORT_READ_INPUT,
+    TRANSPORT_REQUEST_GAP,
+    transport_timeout,
+)
+
+_LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[str] = ["sensor", "button", "number", "select"]
 
+# How often a traffic capture is appended to its file
+RECORD_FLUSH_INTERVAL = timedelta(seconds=10)
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     host = entry.data["host"]
     port = entry.data.get("port", 502)
-    unit_id = entry.data.get("unit_id", 1)
+    unit_id = entry.data.get(CONF_UNIT_ID, DEFAULT_UNIT_ID)
+
+    # Gateway parameters measured by the config flow probe (empty for old entries)
+    transport = entry.data.get(CONF_TRANSPORT, {})
+
+    # Registers in the groups enabled in the options flow (default: all)
+    groups = set(entry.options.get(CONF_REGISTER_GROUPS, REGISTER_GROUPS))
+    registers = [reg for reg in REGISTER_LIST if register_group(reg) in groups]
+
+    # Pipelined reads only where the probe saw overlapping requests survive
+    max_in_flight = 1
+    if transport.get(TRANSPORT_PIPELINING):
+        max_in_flight = entry.options.get(CONF_MAX_IN_FLIGHT, DEFAULT_MAX_IN_FLIGHT)
+
+    # One connection per gateway, shared by every unit ID / entry behind it
+    hub = async_get_hub(
+        hass,
+        host,
+        port,
+        timeout=transport_timeout(transport),
+        request_gap=transport.get(TRANSPORT_REQUEST_GAP, 0.0),
+        max_in_flight=max_in_flight,
+    )
 
-    # Registers you want to poll (keep this list here or load from options)
-    registers = list(REGISTER_LIST.keys())
+    # Opt-in capture of the gateway's traffic, for offline replay
+    if entry.options.get(CONF_RECORD_TRAFFIC, DEFAULT_RECORD_TRAFFIC):
+        _async_start_recording(hass, entry, hub)
 
     coordinator = ModbusCoordinator(
         hass=hass,
@@ -21,20 +86,143 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         port=port,
         unit_id=unit_id,
         registers=registers,
-        interval_seconds=30,  # was 15
+        interval_seconds=30,  # "normal" poll class; fast/slow/static follow POLL_INTERVALS
+        timeout=transport_timeout(transport),
+        read_input=transport.get(TRANSPORT_READ_INPUT, True),
+        max_read_count=transport.get(TRANSPORT_MAX_READ_COUNT, MAX_READ_COUNT),
+        request_gap=transport.get(TRANSPORT_REQUEST_GAP, 0.0),
+        # adaptive fast-tier bounds from the options flow
+        min_interval=entry.options.get(CONF_SCAN_INTERVAL_MIN, DEFAULT_SCAN_INTERVAL_MIN),
+        max_interval=entry.options.get(CONF_SCAN_INTERVAL_MAX, DEFAULT_SCAN_INTERVAL_MAX),
+        hub=hub,
+        force_writes=entry.options.get(CONF_FORCE_WRITES, DEFAULT_FORCE_WRITES),
     )
 
-    await coordinator.async_config_entry_first_refresh()
+    # Skip addresses the device rejects; scan any not classified yet
+    address_map = AddressMap(hass, entry.entry_id)
+    await address_map.async_load()
+    coordinator.set_invalid_addresses(address_map.invalid)
+
+    # Until entities subscribe, skip registers whose sensor is disabled
+    coordinator.set_wanted_registers(_registers_with_enabled_sensors(hass, entry, registers))
+
+    # Last session's values: entities start with them instead of waiting on the device
+    snapshot = SnapshotStore(hass, entry.entry_id)
+    restored = await snapshot.async_load()
+
+    if restored:
+        coordinator.async_restore(restored)
+        # Live data (and any pending address scan) arrives in the background
+        entry.async_create_background_task(
+            hass,
+            _async_first_poll(coordinator, address_map),
+            f"{DOMAIN} first poll {entry.entry_id}",
+        )
+    else:
+        # Nothing to show yet: first setup keeps the blocking scan and poll, so
+        # an unreachable device retries setup instead of showing empty entities
+        await _async_discover(coordinator, address_map)
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception:
+            await coordinator.async_close()
+            async_release_hub(hass, hub)
+            raise
+
+    # Persist each successful poll's values (throttled by the store)
+    @callback
+    def _save_snapshot() -> None:
+        if coordinator.last_update_success and coordinator.data:
+            snapshot.async_schedule_save(lambda: coordinator.data or {})
+
+    entry.async_on_unload(coordinator.async_add_listener(_save_snapshot))
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
         "coordinator": coordinator,
+        "hub": hub,
     }
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    # Entities are up: poll exactly what enabled entities subscribe to
+    coordinator.async_track_subscriptions()
+
+    # Reload when options change so the coordinator picks up new bounds
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
     return True
 
+def _async_start_recording(hass: HomeAssistant, entry: ConfigEntry, hub: ModbusHub) -> None:
+    """Record the hub's traffic to <config>/CAPTURE_FILE while loaded.
+
+    Entries sharing the gateway share one capture; the entry that started it
+    stops it on unload.
+    """
+    recorder = hub.recorder
+    owner = recorder is None
+    if recorder is None:
+        path = hass.config.path(CAPTURE_FILE.format(host=slugify(hub.host), port=hub.port))
+        recorder = TrafficRecorder(path, hub.host, hub.port)
+        hub.set_recorder(recorder)
+        _LOGGER.info("Recording Modbus traffic to %s", path)
+
+    async def _async_flush(_now=None) -> None:
+        await hass.async_add_executor_job(recorder.flush)
+
+    entry.async_on_unload(
+        async_track_time_interval(hass, _async_flush, RECORD_FLUSH_INTERVAL)
+    )
+
+    @callback
+    def _stop() -> None:
+        if owner and hub.recorder is recorder:
+            hub.set_recorder(None)
+        hass.async_create_task(_async_flush())
+
+    entry.async_on_unload(_stop)
+
+async def _async_discover(coordinator: ModbusCoordinator, address_map: AddressMap) -> None:
+    """Classify addresses no previous scan has seen and replan around invalid ones."""
+    unknown = address_map.unknown(coordinator.scan_addresses)
+    if not unknown:
+        return
+    try:
+        valid, invalid = await coordinator.async_discover_addresses(unknown)
+    except Exception as err:  # pylint: disable=broad-except
+        # Not fatal: poll as planned and retry the scan on next setup
+        _LOGGER.warning("Address discovery failed (%s); will retry on next start", err)
+    else:
+        address_map.update(valid, invalid)
+        await address_map.async_save()
+        coordinator.set_invalid_addresses(address_map.invalid)
+
+async def _async_first_poll(coordinator: ModbusCoordinator, address_map: AddressMap) -> None:
+    """Scan and poll after a restored startup, off the setup path."""
+    await _async_discover(coordinator, address_map)
+    # On failure the restored values stay published as last-known-good
+    await coordinator.async_refresh()
+
+def _registers_with_enabled_sensors(
+    hass: HomeAssistant, entry: ConfigEntry, registers: list[int]
+) -> list[int]:
+    disabled = {
+        entity.unique_id
+        for entity in er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)
+        if entity.disabled_by is not None
+    }
+    return [reg for reg in registers if f"{entry.entry_id}_reg_{reg}" not in disabled]
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await hass.config_entries.async_reload(entry.entry_id)
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await AddressMap(hass, entry.entry_id).async_remove()
+    await SnapshotStore(hass, entry.entry_id).async_remove()
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+        data = hass.data[DOMAIN].pop(entry.entry_id, None)
+        if data:
+            await data["coordinator"].async_close()
+            async_release_hub(hass, data["hub"])
     return unload_ok
\ No newline at end of file
@@ -0,0 +1,88 @@
+"""Adaptive poll interval for the fast tier.
+
+Polls faster while battery/PV power and SoC are moving, slower while they are
+flat, and backs off when the link gets slow or starts failing. The result is
+always clamped to the user's floor/ceiling from the options flow.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping, Optional
+
+# Relative step applied per cycle
+SPEED_UP = 0.5     # busy: halve the interval
+SLOW_DOWN = 1.25   # flat: stretch it by a quarter
+
+# Activity (largest change / threshold) above which we speed up, below which we slow down
+BUSY_ACTIVITY = 1.0
+FLAT_ACTIVITY = 0.2
+
+# Smoothing for cycle time and error rate
+EWMA_ALPHA = 0.2
+
+# A poll cycle should occupy at most 1/LINK_DUTY of the interval
+LINK_DUTY = 5
+
+# Extra stretch at a 100 % error rate
+ERROR_BACKOFF = 4.0
+
+
+class AdaptiveInterval:
+    """Chooses the next fast-tier interval from activity and link health."""
+
+    def __init__(
+        self,
+        floor: float,
+        ceiling: float,
+        thresholds: Mapping[int, float],
+        initial: Optional[float] = None,
+    ) -> None:
+        self.floor = float(min(floor, ceiling))
+        self.ceiling = float(max(floor, ceiling))
+        self._thresholds = dict(thresholds)
+        self._base = self._clamp(initial if initial is not None else self.floor)
+        self._previous: Dict[int, Any] = {}
+        self.cycle_time: Optional[float] = None
+        self.error_rate = 0.0
+        self.interval = self._base
+
+    def _clamp(self, value: float) -> float:
+        return max(self.floor, min(self.ceiling, value))
+
+    def _activity(self, values: Mapping[int, Any]) -> Optional[float]:
+        """Largest change since the last sample, in units of each register's threshold."""
+        activity: Optional[float] = None
+        for reg, threshold in self._thresholds.items():
+            new, old = values.get(reg), self._previous.get(reg)
+            if isinstance(new, (int, float)) and isinstance(old, (int, float)) and threshold:
+                change = abs(new - old) / threshold
+                activity = change if activity is None else max(activity, change)
+        return activity
+
+    def update(
+        self, values: Mapping[int, Any], cycle_time: Optional[float], failed: bool
+    ) -> float:
+        """Feed one poll cycle's result; return the next interval in seconds."""
+        self.error_rate += EWMA_ALPHA * ((1.0 if failed else 0.0) - self.error_rate)
+        if cycle_time is not None and not failed:
+            self.cycle_time = (
+                cycle_time
+                if self.cycle_time is None
+                else self.cycle_time + EWMA_ALPHA * (cycle_time - self.cycle_time)
+            )
+
+        if not failed:
+            activity = self._activity(values)
+            if activity is not None:
+                if activity >= BUSY_ACTIVITY:
+                    self._base = self._clamp(self._base * SPEED_UP)
+                elif activity < FLAT_ACTIVITY:
+                    self._base = self._clamp(self._base * SLOW_DOWN)
+            self._previous = {reg: values.get(reg) for reg in self._thresholds}
+
+        # link health: never let polling saturate the link, back off on errors
+        interval = self._base * (1 + ERROR_BACKOFF * self.error_rate)
+        if self.cycle_time is not None:
+            interval = max(interval, LINK_DUTY * self.cycle_time)
+
+        self.interval = round(self._clamp(interval), 1)
+        return self.interval
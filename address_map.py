@@ -0,0 +1,69 @@
+"""Per-entry map of the addresses the inverter actually serves.
+
+Reserved words and model-specific blocks in the 3000-3320 range answer with
+Illegal Data Address. A one-time scan records which addresses are valid so the
+read planner never builds a block across an invalid one and entities are not
+created for registers that always fail. The map is persisted with HA's storage
+helper, one file per config entry.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+STORAGE_VERSION = 1
+
+
+def to_spans(addresses: Iterable[int]) -> List[Tuple[int, int]]:
+    """{1, 2, 3, 7} -> [(1, 3), (7, 7)]"""
+    spans: List[Tuple[int, int]] = []
+    for address in sorted(set(addresses)):
+        if spans and address == spans[-1][1] + 1:
+            spans[-1] = (spans[-1][0], address)
+        else:
+            spans.append((address, address))
+    return spans
+
+
+def from_spans(spans: Iterable[Iterable[int]]) -> Set[int]:
+    result: Set[int] = set()
+    for start, end in spans:
+        result.update(range(start, end + 1))
+    return result
+
+
+class AddressMap:
+    """Valid/invalid addresses discovered for one config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store[Dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.address_map"
+        )
+        self.valid: Set[int] = set()
+        self.invalid: Set[int] = set()
+
+    async def async_load(self) -> None:
+        data = await self._store.async_load() or {}
+        self.valid = from_spans(data.get("valid", []))
+        self.invalid = from_spans(data.get("invalid", []))
+
+    async def async_save(self) -> None:
+        await self._store.async_save(
+            {"valid": to_spans(self.valid), "invalid": to_spans(self.invalid)}
+        )
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
+
+    def unknown(self, addresses: Iterable[int]) -> Set[int]:
+        """Addresses not classified by a previous scan."""
+        return set(addresses) - self.valid - self.invalid
+
+    def update(self, valid: Iterable[int], invalid: Iterable[int]) -> None:
+        self.valid.update(valid)
+        self.invalid.update(invalid)
+        self.valid -= self.invalid
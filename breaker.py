@@ -0,0 +1,61 @@
+"""Per-block circuit breakers for the poll loop.
+
+A block that keeps failing (a span the firmware rejects, a register that
+times out) is skipped for a cooldown instead of being retried every cycle,
+so it cannot slow down or fail the reads of every other block. After the
+cooldown one trial read decides: success closes the breaker, another failure
+reopens it for twice as long.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Tuple
+
+# Consecutive failed cycles before a block's breaker opens
+BREAKER_THRESHOLD = 3
+
+# First cooldown (s); doubles on every trip, up to the maximum
+BREAKER_COOLDOWN = 30.0
+BREAKER_MAX_COOLDOWN = 900.0
+
+
+@dataclass
+class _BreakerState:
+    failures: int = 0
+    trips: int = 0
+    open_until: float = 0.0
+
+
+class BlockBreakers:
+    """Failure counts and cooldowns keyed by block."""
+
+    def __init__(self) -> None:
+        self._states: Dict[Hashable, _BreakerState] = {}
+
+    def allow(self, key: Hashable, now: float) -> bool:
+        """False while the block's breaker is open."""
+        state = self._states.get(key)
+        return state is None or now >= state.open_until
+
+    def record_success(self, key: Hashable) -> None:
+        self._states.pop(key, None)
+
+    def record_failure(self, key: Hashable, now: float) -> bool:
+        """Count a failure; True if this one opened the breaker."""
+        state = self._states.setdefault(key, _BreakerState())
+        state.failures += 1
+        if state.failures < BREAKER_THRESHOLD:
+            return False
+        state.open_until = now + min(
+            BREAKER_MAX_COOLDOWN, BREAKER_COOLDOWN * (2 ** state.trips)
+        )
+        state.trips += 1
+        return True
+
+    def open(self, now: float) -> List[Tuple[Hashable, float]]:
+        """Open breakers and their remaining cooldown (for diagnostics)."""
+        return [
+            (key, round(state.open_until - now, 1))
+            for key, state in self._states.items()
+            if state.open_until > now
+        ]
@@ -0,0 +1,114 @@
+"""Typed decoding of xStorage register blocks.
+
+Each planned read block is compiled once into a `struct` layout built from the
+register schema in const.py, so a response is decoded, typed and scaled in a
+single unpack.
+"""
+from __future__ import annotations
+
+import struct
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .const import REG_ASCII, REG_BCD, REG_S16, REG_U16, REG_U32
+from .planner import ReadBlock
+
+# struct code and word width per fixed-size type
+_FIXED: Dict[str, Tuple[str, int]] = {
+    REG_U16: ("H", 1),
+    REG_S16: ("h", 1),
+    REG_U32: ("I", 2),
+    REG_BCD: ("H", 1),
+}
+
+
+def register_width(spec: Optional[Mapping[str, Any]]) -> int:
+    """Number of 16-bit words a register spans."""
+    spec = spec or {}
+    reg_type = spec.get("type", REG_U16)
+    if reg_type == REG_ASCII:
+        return max(1, int(spec.get("length", 1)))
+    return _FIXED.get(reg_type, ("H", 1))[1]
+
+
+def register_widths(registers: Sequence[int], specs: Mapping[int, Mapping[str, Any]]) -> Dict[int, int]:
+    """Widths of the multi-word registers in `registers` (for the planner)."""
+    widths: Dict[int, int] = {}
+    for reg in registers:
+        width = register_width(specs.get(reg))
+        if width > 1:
+            widths[reg] = width
+    return widths
+
+
+def _decode_bcd(raw: int) -> int:
+    value = 0
+    for shift in (12, 8, 4, 0):
+        value = value * 10 + ((raw >> shift) & 0xF)
+    return value
+
+
+def _decode_ascii(raw: bytes) -> str:
+    return raw.replace(b"\x00", b"").decode("ascii", errors="replace").strip()
+
+
+def _scaler(scale: float) -> Callable[[int], Any]:
+    # round to the scale's own resolution so 0.1 * 2301 shows as 230.1
+    digits = max(0, len(f"{scale:g}".partition(".")[2]))
+    return lambda raw: round(raw * scale, digits)
+
+
+class BlockDecoder:
+    """Decoder for one ReadBlock, compiled from the register schema."""
+
+    def __init__(self, block: ReadBlock, specs: Mapping[int, Mapping[str, Any]]) -> None:
+        self.block = block
+        fmt: List[str] = [">"]
+        fields: List[Tuple[int, Optional[Callable[[Any], Any]]]] = []
+        pos = block.start
+
+        for reg in block.registers:
+            spec = specs.get(reg) or {}
+            reg_type = spec.get("type", REG_U16)
+            width = register_width(spec)
+            if reg < pos:
+                raise ValueError(f"Register {reg} overlaps the previous value in its block")
+            if reg > pos:
+                fmt.append(f"{2 * (reg - pos)}x")
+
+            if reg_type == REG_ASCII:
+                fmt.append(f"{2 * width}s")
+                convert: Optional[Callable[[Any], Any]] = _decode_ascii
+            else:
+                fmt.append(_FIXED.get(reg_type, ("H", 1))[0])
+                scale = spec.get("scale", 1)
+                if reg_type == REG_BCD:
+                    convert = _decode_bcd
+                elif scale != 1:
+                    convert = _scaler(scale)
+                else:
+                    convert = None
+
+            fields.append((reg, convert))
+            pos = reg + width
+
+        self._struct = struct.Struct("".join(fmt))
+        self._words = struct.Struct(f">{block.count}H")
+        self._fields = fields
+
+    def decode_values(self, words: Sequence[int]) -> List[Any]:
+        """Decode a block response into typed, scaled values in block.registers order."""
+        if len(words) < self.block.count:
+            raise ValueError(
+                f"Short response for block {self.block.start}+{self.block.count}: "
+                f"got {len(words)} words"
+            )
+        buf = self._words.pack(*words[: self.block.count])
+        raw = self._struct.unpack_from(buf)
+        return [
+            value if convert is None else convert(value)
+            for (_, convert), value in zip(self._fields, raw)
+        ]
+
+    def decode(self, words: Sequence[int]) -> Dict[int, Any]:
+        """Decode a block response into {register: typed, scaled value}."""
+        return dict(zip(self.block.registers, self.decode_values(words)))
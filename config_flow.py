@@ -1,22 +1,70 @@
 """Config flow for Eaton xStorage Hybrid integration."""
+from __future__ import annotations
+
 import logging
 from typing import Any
 
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.const import CONF_HOST, CONF_PORT
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 import homeassistant.helpers.config_validation as cv
 
-from .const import DEFAULT_PORT, DOMAIN
+from .const import (
+    CONF_FORCE_WRITES,
+    CONF_MAX_IN_FLIGHT,
+    CONF_RECORD_TRAFFIC,
+    CONF_REGISTER_GROUPS,
+    CONF_SCAN_INTERVAL_MAX,
+    CONF_SCAN_INTERVAL_MIN,
+    CONF_TRANSPORT,
+    CONF_UNIT_ID,
+    DEFAULT_FORCE_WRITES,
+    DEFAULT_MAX_IN_FLIGHT,
+    DEFAULT_PORT,
+    DEFAULT_RECORD_TRAFFIC,
+    DEFAULT_SCAN_INTERVAL_MAX,
+    DEFAULT_SCAN_INTERVAL_MIN,
+    DEFAULT_UNIT_ID,
+    DOMAIN,
+    REGISTER_GROUPS,
+)
+from .probe import ProbeError, async_probe_gateway
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _unique_id(data: dict[str, Any]) -> str:
+    """Host for unit 1 (as before unit IDs were configurable), host/unit otherwise."""
+    unit_id = data.get(CONF_UNIT_ID, DEFAULT_UNIT_ID)
+    return data[CONF_HOST] if unit_id == DEFAULT_UNIT_ID else f"{data[CONF_HOST]}/{unit_id}"
+
+
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
+    """Probe the gateway; returns the entry title and tuned transport parameters."""
+    unit_id = data.get(CONF_UNIT_ID, DEFAULT_UNIT_ID)
+    title = f"xStorage Hybrid ({data[CONF_HOST]})"
+    if unit_id != DEFAULT_UNIT_ID:
+        title = f"xStorage Hybrid ({data[CONF_HOST]} unit {unit_id})"
+
+    # Another inverter on this gateway was probed already. Its entry holds the
+    # gateway's single session, so a probe connection would be refused anyway.
+    for entry in hass.config_entries.async_entries(DOMAIN):
+        if (
+            entry.data.get(CONF_HOST) == data[CONF_HOST]
+            and entry.data.get(CONF_PORT) == data[CONF_PORT]
+            and entry.data.get(CONF_TRANSPORT)
+        ):
+            _LOGGER.info("Reusing transport settings of %s", entry.title)
+            return {"title": title, "transport": dict(entry.data[CONF_TRANSPORT])}
+
     _LOGGER.info("Validating connection to %s:%s", data[CONF_HOST], data[CONF_PORT])
-    return {"title": f"xStorage Hybrid ({data[CONF_HOST]})"}
+    try:
+        transport = await async_probe_gateway(data[CONF_HOST], data[CONF_PORT], unit_id)
+    except ProbeError as err:
+        raise CannotConnect(str(err)) from err
+    return {"title": title, "transport": transport}
 
 
 class XStorageHybridConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -28,13 +76,22 @@ class XStorageHybridConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1  # Schema version for the config entry
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> XStorageHybridOptionsFlow:
+        """Return the options flow handler."""
+        return XStorageHybridOptionsFlow(config_entry)
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle the initial step when user initiates the configuration.
         
         This is the first step in the config flow, where we ask for
-        the IP address and port of the Modbus device.
+        the IP address and port of the Modbus device, and its unit ID. Parallel
+        inverters behind one gateway are added as one entry per unit ID.
         
         Args:
             user_input: Dictionary containing user input, or None on first call
@@ -47,18 +104,25 @@ class XStorageHybridConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
         # If user has submitted the form
         if user_input is not None:
+            # Create a unique ID based on the host (and unit ID)
+            # This prevents duplicate entries (and a needless probe) for the same device
+            await self.async_set_unique_id(_unique_id(user_input))
+            self._abort_if_unique_id_configured()
+
             try:
-                # Validate the input
+                # Validate the input by probing the gateway
                 info = await validate_input(self.hass, user_input)
-                
-                # Create a unique ID based on the host
-                # This prevents duplicate entries for the same device
-                await self.async_set_unique_id(user_input[CONF_HOST])
-                self._abort_if_unique_id_configured()
-                
-                # Create the config entry with the validated data
-                return self.async_create_entry(title=info["title"], data=user_input)
-                
+
+                # Create the config entry with the validated data and the
+                # probed transport parameters
+                return self.async_create_entry(
+                    title=info["title"],
+                    data={**user_input, CONF_TRANSPORT: info["transport"]},
+                )
+
+            except CannotConnect as err:
+                _LOGGER.warning("Cannot connect to %s: %s", user_input[CONF_HOST], err)
+                errors["base"] = "cannot_connect"
             except Exception as err:  # pylint: disable=broad-except
                 _LOGGER.exception("Unexpected exception during validation: %s", err)
                 errors["base"] = "cannot_connect"
@@ -69,6 +133,9 @@ class XStorageHybridConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             {
                 vol.Required(CONF_HOST): cv.string,  # IP address (required)
                 vol.Required(CONF_PORT, default=DEFAULT_PORT): cv.port,  # Port with default value
+                vol.Required(CONF_UNIT_ID, default=DEFAULT_UNIT_ID): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=247)
+                ),  # Modbus unit ID (parallel inverters: 1-4)
             }
         )
 
@@ -80,6 +147,64 @@ class XStorageHybridConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         )
 
 
+class XStorageHybridOptionsFlow(config_entries.OptionsFlowWithConfigEntry):
+    """Handle options for Eaton xStorage Hybrid.
+
+    Lets the user bound the adaptive poll interval: the fast tier speeds up
+    while power/SoC are moving and slows down when flat or when the link
+    struggles, but always stays between these two values. Also picks which
+    register groups get entities; registers outside them are never polled.
+    The in-flight window applies only to gateways that passed the pipelining
+    probe; others always read one block at a time. Writes of a value the
+    device recently reported holding are skipped unless forced. Traffic
+    recording captures the gateway's requests and responses for offline replay.
+    """
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the poll interval bounds and enabled register groups."""
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            if user_input[CONF_SCAN_INTERVAL_MIN] > user_input[CONF_SCAN_INTERVAL_MAX]:
+                errors["base"] = "min_above_max"
+            else:
+                return self.async_create_entry(title="", data=user_input)
+
+        options = self.config_entry.options
+        data_schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_SCAN_INTERVAL_MIN,
+                    default=options.get(CONF_SCAN_INTERVAL_MIN, DEFAULT_SCAN_INTERVAL_MIN),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),  # seconds
+                vol.Required(
+                    CONF_SCAN_INTERVAL_MAX,
+                    default=options.get(CONF_SCAN_INTERVAL_MAX, DEFAULT_SCAN_INTERVAL_MAX),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3600)),  # seconds
+                vol.Required(
+                    CONF_REGISTER_GROUPS,
+                    default=options.get(CONF_REGISTER_GROUPS, list(REGISTER_GROUPS)),
+                ): cv.multi_select({name: name for name in REGISTER_GROUPS}),
+                vol.Required(
+                    CONF_MAX_IN_FLIGHT,
+                    default=options.get(CONF_MAX_IN_FLIGHT, DEFAULT_MAX_IN_FLIGHT),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=16)),  # requests
+                vol.Required(
+                    CONF_FORCE_WRITES,
+                    default=options.get(CONF_FORCE_WRITES, DEFAULT_FORCE_WRITES),
+                ): bool,
+                vol.Required(
+                    CONF_RECORD_TRAFFIC,
+                    default=options.get(CONF_RECORD_TRAFFIC, DEFAULT_RECORD_TRAFFIC),
+                ): bool,
+            }
+        )
+
+        return self.async_show_form(step_id="init", data_schema=data_schema, errors=errors)
+
+
 class CannotConnect(Exception):
     """Error to indicate we cannot connect to the device."""
 
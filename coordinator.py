@@ -1,15 +1,97 @@
 from __future__ import annotations
 from datetime import timedelta
-from typing import Dict, List
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import asyncio
 import logging
+import time
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
-from pymodbus.client import AsyncModbusTcpClient  # the build you're using
+from pymodbus.exceptions import ConnectionException
+
+from .adaptive import AdaptiveInterval
+from .breaker import BlockBreakers
+from .codec import BlockDecoder, register_width, register_widths
+from .const import (
+    ACTIVITY_THRESHOLDS,
+    POLL_FAST,
+    POLL_INTERVALS,
+    POLL_NORMAL,
+    REGISTER_LIST,
+    SAMPLE_BUFFER_SIZE,
+    SAMPLE_INTERVAL,
+    SAMPLE_WINDOW,
+    SAMPLED_REGISTERS,
+    WRITE_SETTLE_DELAYS,
+)
+from .hub import (
+    PRIORITY_BULK,
+    PRIORITY_FAST,
+    PRIORITY_WRITE,
+    ModbusClient,
+    ModbusHub,
+    RequestDeferred,
+)
+from .planner import (
+    DEFAULT_MAX_GAP,
+    MAX_READ_COUNT,
+    ReadBlock,
+    WriteBatch,
+    plan_read_blocks,
+    plan_write_batches,
+)
+from .sampler import PowerSampler
+from .snapshot import RegisterSnapshot
+from .stats import PollStats
 
 _LOGGER = logging.getLogger(__name__)
 
-class ModbusCoordinator(DataUpdateCoordinator[Dict[int, int]]):
+# Exception codes meaning "this span is not served" (bisect it); anything else
+# during an address scan is treated as transient
+ILLEGAL_EXCEPTION_CODES = (0x02, 0x03)  # Illegal Data Address / Illegal Data Value
+
+# Exception codes worth retrying within the cycle
+RETRY_EXCEPTION_CODES = (0x05, 0x06)  # Acknowledge / Server Device Busy
+
+# Extra attempts per block read, with a linearly growing pause (s)
+BLOCK_RETRIES = 2
+BLOCK_RETRY_DELAY = 0.2
+
+# A register is unavailable once its value is older than this many of its
+# tier's intervals (and at least STALE_MIN_AGE seconds)
+STALE_INTERVALS = 3
+STALE_MIN_AGE = 60.0
+
+# Share of the coordinator tick a cycle may spend; bulk (non-fast) reads that
+# have not started by then are deferred to the next cycle
+CYCLE_BUDGET = 0.8
+
+# A write is skipped when the device reported the same word within this many
+# seconds (by a poll or a write read-back)
+WRITE_DEDUP_MAX_AGE = 60.0
+
+# REGISTER_LIST keys that filter what gets published to entities
+PUBLISH_RULE_KEYS = ("deadband", "min_interval", "max_interval")
+
+def _block_key(block: ReadBlock) -> Tuple[int, int]:
+    # breakers outlive replans of the same span
+    return block.start, block.count
+
+
+def _connection_lost(err: BaseException) -> bool:
+    """Whether `err` leaves the socket unusable, not just one transaction unanswered.
+
+    A timed-out transaction says nothing about the others in flight on the
+    same socket (pipelined reads, other devices); if the link is really gone,
+    the whole cycle fails and _async_update_data drops it.
+    """
+    if isinstance(err, asyncio.TimeoutError):
+        return False
+    return isinstance(err, (OSError, ConnectionException))
+
+
+class ModbusCoordinator(DataUpdateCoordinator[RegisterSnapshot]):
     def __init__(
         self,
         hass: HomeAssistant,
@@ -17,77 +99,927 @@ class ModbusCoordinator(DataUpdateCoordinator[Dict[int, int]]):
         port: int,
         unit_id: int,
         registers: List[int],
-        interval_seconds: int = 60,
+        interval_seconds: int = 60,   # cadence of the "normal" poll class
         timeout: float = 2.0,
         read_input: bool = True,   # True: read_input_registers (3xxxx), False: read_holding_registers (4xxxx)
+        max_read_count: int = MAX_READ_COUNT,
+        max_gap: int = DEFAULT_MAX_GAP,
+        tier_intervals: Optional[Dict[str, Optional[int]]] = None,
+        request_gap: float = 0.0,   # idle time the gateway needs between frames (s)
+        min_interval: Optional[float] = None,   # adaptive fast-tier floor (s)
+        max_interval: Optional[float] = None,   # adaptive fast-tier ceiling (s)
+        hub: Optional[ModbusHub] = None,   # shared gateway transport (None = private)
+        max_in_flight: int = 1,   # pipelined requests on a private hub (1 = sequential)
+        force_writes: bool = False,   # never skip writes of values already held
     ) -> None:
+        # seconds between reads per poll class; None = once per session
+        intervals: Dict[str, Optional[int]] = {**POLL_INTERVALS, POLL_NORMAL: interval_seconds}
+        intervals.update(tier_intervals or {})
+
         super().__init__(
             hass,
             _LOGGER,
-            name="modbus_coordinator",
+            name=f"modbus_coordinator_{host}_{unit_id}",
             update_interval=timedelta(seconds=interval_seconds),
         )
-        self._host = host
-        self._port = port
         self._unit_id = unit_id
         self._registers = registers
-        self._timeout = timeout
         self._read_input = read_input
 
-        # per-register cache of last-known-good values
-        self._last_values: Dict[int, int] = {}
+        # contiguous block reads per poll class, planned by _replan()
+        self._tier_intervals = intervals
+        self._max_read_count = max_read_count
+        self._max_gap = max_gap
+        self._invalid: Set[int] = set()
+        # registers backing enabled entities (None = poll all); once
+        # subscriptions are tracked, rebuilt from the register listeners
+        self._wanted: Optional[Set[int]] = None
+        self._track_subscriptions = False
+        self._subscriptions_changed = False
+        self._tier_blocks: Dict[str, List[ReadBlock]] = {}
+        self._tier_registers: Dict[str, List[int]] = {}
+        self._decoders: Dict[ReadBlock, BlockDecoder] = {}
+        # hub priority per block (fast tier ahead of bulk reads)
+        self._block_priority: Dict[ReadBlock, int] = {}
+        # bulk blocks the last cycle's budget pushed out, read first next cycle
+        self._deferred: List[ReadBlock] = []
+        # monotonic time each tier is next due; 0 = due now
+        self._tier_due: Dict[str, float] = {}
+        # blocks holding sampled power registers are also read every
+        # SAMPLE_INTERVAL, whatever their tier's (adaptive) interval
+        self._sample_due = 0.0
+        # whether the last cycle read the fast tier (the adaptive interval
+        # only learns from those)
+        self._fast_polled = False
+        self._last_poll_at = 0.0
+        self._replan()
 
-    async def _async_update_data(self) -> Dict[int, int]:
-        """Connect per cycle, read registers, keep last values on transient failures."""
-        result: Dict[int, int] = {}
+        # fast-tier interval follows activity and link health within the
+        # user's floor/ceiling (None = fixed intervals)
+        self._adaptive: Optional[AdaptiveInterval] = None
+        if min_interval is not None or max_interval is not None:
+            self._adaptive = AdaptiveInterval(
+                floor=min_interval if min_interval is not None else 1,
+                ceiling=(
+                    max_interval if max_interval is not None
+                    else self.update_interval.total_seconds()
+                ),
+                thresholds=ACTIVITY_THRESHOLDS,
+                initial=intervals[POLL_FAST],
+            )
 
-        client = AsyncModbusTcpClient(self._host, port=self._port, timeout=self._timeout)
+        # last-known-good raw words and decoded values, preallocated and
+        # updated in place; doubles as self.data
+        self._snapshot = RegisterSnapshot(registers, REGISTER_LIST)
 
-        try:
-            connected = await client.connect()
-            if not connected and not getattr(client, "connected", False):
-                raise RuntimeError("Unable to open Modbus TCP connection")
-
-            # Pick the function based on your map
-            async_read = (
-                client.read_input_registers
-                if self._read_input
-                else client.read_holding_registers
+        # every read of the power registers is sampled; aggregates and energy
+        # are published once per window
+        self.sampler = PowerSampler(
+            [reg for reg in SAMPLED_REGISTERS if reg in registers],
+            size=SAMPLE_BUFFER_SIZE,
+            window=SAMPLE_WINDOW,
+        )
+        self._window_closed = False
+
+        # connection, reconnect backoff and request gap live in the hub, which
+        # other unit IDs / config entries on the same gateway may share
+        self._owns_hub = hub is None
+        self._hub = hub or ModbusHub(
+            host, port, timeout=timeout, request_gap=request_gap, max_in_flight=max_in_flight
+        )
+
+        # phase timings, per-block latency histograms and error counters
+        self.stats = PollStats()
+
+        # blocks that keep failing are paused instead of retried every cycle
+        self._breakers = BlockBreakers()
+
+        # serializes this device's polls (and address scans); the hub
+        # interleaves requests of different devices between them
+        self._lock = asyncio.Lock()
+        # writes only wait for each other: their requests jump the poll's
+        # queue at the hub instead of waiting for the whole cycle
+        self._write_lock = asyncio.Lock()
+        # bumped per written batch; reads started before a register's epoch
+        # may carry its pre-write value and are not stored
+        self._write_epoch = 0
+        self._register_epochs: Dict[int, int] = {}
+        # raw word and monotonic time of each write the read-back confirmed
+        # (covers registers that are written but never polled)
+        self._confirmed: Dict[int, Tuple[int, float]] = {}
+        self.force_writes = force_writes
+        # decoded value last written to registers without a snapshot slot
+        # (write-only controls, deselected groups), and those changed since
+        # listeners were last notified
+        self._written: Dict[int, Any] = {}
+        self._written_changed: Set[int] = set()
+
+        # per-register listeners, notified only when their value changes
+        self._register_listeners: Dict[int, List[CALLBACK_TYPE]] = {}
+        # published (deadband-filtered) value and freshness per snapshot slot
+        self._published: List[Any] = [None] * len(self._snapshot.registers)
+        self._published_fresh = bytearray(len(self._snapshot.registers))
+        self._slot_tiers = [self._register_tier(reg) for reg in self._snapshot.registers]
+        self._published_available = True
+
+        # deadband / publish-interval rules from REGISTER_LIST, and when each
+        # register was last published
+        self._publish_rules: Dict[int, Dict[str, float]] = {}
+        for reg in registers:
+            spec = REGISTER_LIST.get(reg, {})
+            rules = {key: spec[key] for key in PUBLISH_RULE_KEYS if key in spec}
+            if rules:
+                self._publish_rules[reg] = rules
+        self._published_at: Dict[int, float] = {}
+
+    def _replan(self) -> None:
+        """(Re)build per-tier read blocks and decoders for the active registers."""
+        # registers grouped by poll class, each planned separately so a fast
+        # tier never drags slow neighbours into its blocks
+        by_tier: Dict[str, List[int]] = {}
+        active = self.active_registers
+        for reg in active:
+            by_tier.setdefault(self._register_tier(reg), []).append(reg)
+
+        widths = register_widths(active, REGISTER_LIST)
+        self._tier_blocks = {
+            tier: plan_read_blocks(
+                regs,
+                max_count=self._max_read_count,
+                max_gap=self._max_gap,
+                widths=widths,
+                invalid=self._invalid,
             )
+            for tier, regs in by_tier.items()
+        }
+        # one compiled decoder per block: typed + scaled values in a single unpack
+        self._decoders = {
+            block: self._decoders.get(block) or BlockDecoder(block, REGISTER_LIST)
+            for block in self.blocks
+        }
+        self._block_priority = {
+            block: PRIORITY_FAST if tier == POLL_FAST else PRIORITY_BULK
+            for tier, blocks in self._tier_blocks.items()
+            for block in blocks
+        }
+        # sampled power registers per block (see sampler.py); sampling reads
+        # are as urgent as the fast tier
+        self._block_samples: Dict[ReadBlock, Tuple[int, ...]] = {}
+        for block in self.blocks:
+            samples = tuple(reg for reg in block.registers if reg in SAMPLED_REGISTERS)
+            if samples:
+                self._block_samples[block] = samples
+                self._block_priority[block] = PRIORITY_FAST
+        # tiers that gained registers are due now; others keep their schedule
+        self._tier_due = {
+            tier: self._tier_due.get(tier, 0.0)
+            if set(regs) <= set(self._tier_registers.get(tier, ()))
+            else 0.0
+            for tier, regs in by_tier.items()
+        }
+        self._tier_registers = by_tier
+        self._update_tick()
 
-            for reg in self._registers:
-                # IMPORTANT: keep using device_id as you requested
-                rr = await async_read(address=reg, count=1, device_id=self._unit_id)
+    def _register_tier(self, register: int) -> str:
+        tier = REGISTER_LIST.get(register, {}).get("poll", POLL_NORMAL)
+        return tier if tier in self._tier_intervals else POLL_NORMAL
 
-                if rr.isError():
-                    # If we already have a value, keep showing it; log the issue
-                    if reg in self._last_values:
-                        _LOGGER.warning("Read error on reg %s: %s; keeping last value", reg, rr)
-                        result[reg] = self._last_values[reg]
-                    else:
-                        # first time for this register and it fails ⇒ no fallback available
-                        raise RuntimeError(f"Error reading register {reg}: {rr}")
+    def _update_tick(self) -> None:
+        """The coordinator ticks at the fastest periodic tier (or sampling cadence)."""
+        periodic = [
+            self._tier_intervals[tier] for tier in self._tier_due
+            if self._tier_intervals[tier] is not None
+        ]
+        if self._block_samples:
+            periodic.append(SAMPLE_INTERVAL)
+        tick = min(periodic) if periodic else self._tier_intervals[POLL_NORMAL]
+        self.update_interval = timedelta(seconds=tick)
+
+    def set_invalid_addresses(self, invalid: Iterable[int]) -> None:
+        """Stop polling addresses the device rejects and never read across them."""
+        invalid = set(invalid)
+        if invalid != self._invalid:
+            self._invalid = invalid
+            self._replan()
+
+    def set_wanted_registers(self, registers: Optional[Iterable[int]]) -> None:
+        """Poll only these registers (None = every configured register)."""
+        wanted = None if registers is None else set(registers)
+        if wanted != self._wanted:
+            self._wanted = wanted
+            self._replan()
+
+    @callback
+    def async_track_subscriptions(self) -> None:
+        """From now on, poll exactly the registers entities subscribe to.
+
+        Called once the platforms are set up: enabled entities have subscribed,
+        disabled ones never will. Later enable/disable changes add or remove
+        listeners and the plan follows at the next cycle.
+        """
+        self._track_subscriptions = True
+        self._subscriptions_changed = True
+
+    def _sync_subscriptions(self) -> None:
+        if self._track_subscriptions and self._subscriptions_changed:
+            self._subscriptions_changed = False
+            self.set_wanted_registers(self._register_listeners)
+
+    @callback
+    def async_restore(self, values: Dict[int, Any]) -> None:
+        """Seed the cache and the published view with a persisted snapshot.
+
+        Entities added afterwards show these values right away; registers the
+        next polls fail to read keep them as last-known-good.
+        """
+        for reg, value in values.items():
+            self._snapshot.set_value(reg, value)
+        self.data = self._snapshot
+        self._publish(time.monotonic())
+
+    @property
+    def scan_addresses(self) -> Set[int]:
+        """Every address the planner may read for the configured registers.
+
+        Includes the gap words blocks bridge, so a discovery scan over these
+        tells the planner which holes are safe to read across.
+        """
+        blocks = plan_read_blocks(
+            self._registers,
+            max_count=self._max_read_count,
+            max_gap=self._max_gap,
+            widths=register_widths(self._registers, REGISTER_LIST),
+        )
+        return {address for block in blocks for address in range(block.start, block.end + 1)}
+
+    async def async_discover_addresses(
+        self, addresses: Iterable[int]
+    ) -> Tuple[Set[int], Set[int]]:
+        """Classify `addresses` as served or rejected (Illegal Data Address).
+
+        Reads the same blocks the planner would and bisects any block the
+        device rejects down to the offending words. Any other failure (timeout,
+        busy) aborts the scan so nothing half-known gets persisted.
+        """
+        valid: Set[int] = set()
+        invalid: Set[int] = set()
+        blocks = plan_read_blocks(
+            addresses, max_count=self._max_read_count, max_gap=self._max_gap
+        )
+        spans = [(block.start, block.end) for block in blocks]
+
+        async with self._lock:
+            while spans:
+                start, end = spans.pop()
+                async with self._hub.transport(self._unit_id):
+                    client = await self._hub.async_client(self.stats)
+                    rr = await self._read_function(client)(
+                        address=start, count=end - start + 1, device_id=self._unit_id
+                    )
+                if not rr.isError():
+                    valid.update(range(start, end + 1))
+                elif getattr(rr, "exception_code", None) not in ILLEGAL_EXCEPTION_CODES:
+                    raise RuntimeError(f"Address scan aborted at {start}-{end}: {rr}")
+                elif start == end:
+                    invalid.add(start)
                 else:
-                    val = rr.registers[0]
-                    result[reg] = val
-                    self._last_values[reg] = val
+                    mid = (start + end) // 2
+                    spans.extend([(start, mid), (mid + 1, end)])
+
+        _LOGGER.debug("Address scan: %s valid, invalid %s", len(valid), sorted(invalid))
+        return valid, invalid
 
-            return result
+    def _close_client(self) -> None:
+        """Drop the shared socket after a transport error; the next request reconnects."""
+        self._hub.close()
+
+    async def async_close(self) -> None:
+        """Close the Modbus connection (called on unload).
+
+        A shared hub is closed by its last user through async_release_hub.
+        """
+        if self._owns_hub:
+            self._hub.close()
+
+    async def _async_update_data(self) -> RegisterSnapshot:
+        """Read planned blocks over the shared connection, keep last values on transient failures."""
+        self.stats.start_cycle()
+        try:
+            async with self._lock:
+                data = await self._async_read_blocks()
+            self.stats.end_cycle(ok=True)
+            self._adapt_interval(failed=False)
+            return data
 
         except Exception as err:
+            # Anything but a device error response leaves the socket in an
+            # unknown state; drop it so the next cycle reconnects
+            if not isinstance(err, RuntimeError):
+                self._close_client()
             # If we have a previous full dataset, return it to keep entities available
             if self.data:
                 _LOGGER.warning("Modbus poll failed (%s); returning last dataset", err)
+                self.stats.mark_stale()
+                self.stats.end_cycle(ok=False)
+                self._adapt_interval(failed=True)
                 return self.data
             # First-ever failure: no previous data to show ⇒ mark as failed
+            self.stats.end_cycle(ok=False)
+            self._adapt_interval(failed=True)
             raise UpdateFailed(f"Modbus update failed: {err}") from err
 
-        finally:
+    def _adapt_interval(self, failed: bool) -> None:
+        """Retune the fast tier (and the coordinator tick) after a fast-tier cycle."""
+        if self._adaptive is None or not self._fast_polled:
+            return
+        last = self.stats.last_cycle
+        interval = self._adaptive.update(
+            self._snapshot, last.duration if last else None, failed
+        )
+        if interval == self._tier_intervals.get(POLL_FAST):
+            return
+
+        _LOGGER.debug("Fast poll interval now %.1fs", interval)
+        self._tier_intervals[POLL_FAST] = interval
+        if POLL_FAST in self._tier_due and self._tier_due[POLL_FAST] != 0.0:
+            self._tier_due[POLL_FAST] = self._last_poll_at + interval
+        self._update_tick()
+
+    def _read_function(self, client: ModbusClient):
+        # Pick the function based on your map
+        return (
+            client.read_input_registers
+            if self._read_input
+            else client.read_holding_registers
+        )
+
+    def _due_tiers(self, now: float) -> List[str]:
+        """Poll classes whose interval has elapsed (fast first)."""
+        # half a second of slack so scheduler jitter never skips a tier
+        due = [tier for tier, at in self._tier_due.items() if now + 0.5 >= at]
+        return sorted(due, key=lambda t: t != POLL_FAST)
+
+    async def _async_read_blocks(self) -> RegisterSnapshot:
+        """Read the blocks of every due poll class. Caller holds the lock.
+
+        Failures are isolated per block: a failing block keeps its last values
+        (and trips its breaker if it keeps failing) while every other block
+        still updates. Only a cycle in which no block could be read fails.
+
+        Bulk reads that have not started within CYCLE_BUDGET of the tick are
+        deferred to the next cycle (ahead of its own bulk reads), so a slow
+        link never makes cycles run into each other.
+
+        Blocks with sampled power registers are read every SAMPLE_INTERVAL
+        even while their tier is not due, so the sampler keeps its rate when
+        the adaptive fast tier stretches towards its ceiling.
+        """
+        self._sync_subscriptions()
+        now = self._last_poll_at = time.monotonic()
+        deadline = now + CYCLE_BUDGET * self.update_interval.total_seconds()
+        epoch = self._write_epoch
+        tiers = self._due_tiers(now)
+        self._fast_polled = POLL_FAST in tiers
+        due = [block for tier in tiers for block in self._tier_blocks[tier]]
+        if now + 0.5 >= self._sample_due:
+            due = [block for block in self._block_samples if block not in due] + due
+        # fast and sampling blocks first, then last cycle's deferred reads,
+        # then the remaining bulk blocks
+        fast = [block for block in due if self._block_priority[block] == PRIORITY_FAST]
+        carried = [
+            block for block in self._deferred
+            if block in self._decoders and block not in due
+        ]
+        due = fast + carried + [block for block in due if block not in fast]
+        blocks = [block for block in due if self._breakers.allow(_block_key(block), now)]
+        if len(blocks) < len(due):
+            self.stats.mark_stale()
+
+        if self._hub.max_in_flight > 1 and len(blocks) > 1:
+            # pipelined: the hub bounds how many are in flight at once
+            results = await asyncio.gather(
+                *(self._async_read_block(block, deadline) for block in blocks),
+                return_exceptions=True,
+            )
+        else:
+            results = []
+            for block in blocks:
+                try:
+                    results.append(await self._async_read_block(block, deadline))
+                except Exception as err:  # pylint: disable=broad-except
+                    results.append(err)
+
+        failed: List[ReadBlock] = []
+        deferred: List[ReadBlock] = []
+        first_error: Optional[BaseException] = None
+        for block, rr in zip(blocks, results):
+            if isinstance(rr, RequestDeferred):
+                # never sent: neither a failure nor a breaker strike
+                deferred.append(block)
+                continue
+            if isinstance(rr, BaseException) or rr.isError():
+                failed.append(block)
+                first_error = first_error or (
+                    rr if isinstance(rr, BaseException)
+                    else RuntimeError(f"Error reading block {block.start}+{block.count}: {rr}")
+                )
+                self._block_failed(block, rr, now)
+                continue
+
+            self._breakers.record_success(_block_key(block))
+            if self._write_epoch != epoch and any(
+                self._register_epochs.get(reg, 0) > epoch for reg in block.registers
+            ):
+                # a write landed while this read was queued or in flight; the
+                # write path already shows (and verifies) the newer values
+                continue
+            started = time.perf_counter()
+            # hi/lo words of a U32 always come from this one response
+            self._snapshot.store_block(
+                block, rr.registers, self._decoders[block].decode_values(rr.registers)
+            )
+            for reg in self._block_samples.get(block, ()):
+                self.sampler.add(time.monotonic(), reg, self._snapshot.get(reg))
+            self.stats.add_phase("decode", time.perf_counter() - started)
+
+        self._deferred = [
+            block for block in deferred if self._block_priority.get(block) == PRIORITY_BULK
+        ]
+        if any(block in self._block_samples for block in blocks):
+            self._sample_due = now + SAMPLE_INTERVAL
+        if deferred:
+            self.stats.count("deferred", len(deferred))
+            _LOGGER.debug("Cycle over budget; deferred %s block(s)", len(deferred))
+
+        attempted = len(blocks) - len(deferred)
+        if attempted and len(failed) == attempted:
+            # nothing came back: let the caller treat the cycle as failed
+            raise first_error or RuntimeError("No block could be read")
+
+        # Aggregate the power samples once per window
+        if self.sampler.close_window(time.monotonic()):
+            self._window_closed = True
+
+        # Periodic tiers are rescheduled (their deferred blocks ride along
+        # next cycle); a read-once tier with a failed or deferred block stays
+        # due (its breaker paces the retries)
+        for tier in tiers:
+            interval = self._tier_intervals[tier]
+            if interval is None:
+                missed = any(
+                    block in failed or block in deferred
+                    for block in self._tier_blocks[tier]
+                )
+                self._tier_due[tier] = 0.0 if missed else float("inf")
+            else:
+                self._tier_due[tier] = now + interval
+
+        # Tiers not due this cycle keep their last-known values
+        return self._snapshot
+
+    def _block_failed(self, block: ReadBlock, result: Any, now: float) -> None:
+        """Count and log a failed block; open its breaker if it keeps failing.
+
+        Only the device's error answer for this block strikes its breaker; a
+        timeout, dropped link or reconnect backoff says nothing about the
+        block and would otherwise trip every breaker during a gateway outage.
+        """
+        self.stats.count("errors")
+        self.stats.mark_stale()
+        if isinstance(result, BaseException):
+            _LOGGER.debug(
+                "Block %s+%s not read (%s); keeping last values",
+                block.start, block.count, result,
+            )
+            return
+        if self._breakers.record_failure(_block_key(block), now):
+            self.stats.count("breaker_trips")
+            _LOGGER.warning(
+                "Block %s+%s keeps failing (%s); pausing its reads",
+                block.start, block.count, result,
+            )
+        else:
+            _LOGGER.debug(
+                "Read error on block %s+%s: %s; keeping last values",
+                block.start, block.count, result,
+            )
+
+    async def _async_read_block(self, block: ReadBlock, deadline: Optional[float] = None):
+        """One block read in its own transport slot, retried on transient errors.
+
+        Bulk blocks must get their slot by `deadline` (the cycle budget) or
+        raise RequestDeferred; fast-tier blocks only have their class deadline.
+        """
+        priority = self._block_priority.get(block, PRIORITY_BULK)
+        if priority != PRIORITY_BULK:
+            deadline = None
+        result: Any = None
+        for attempt in range(BLOCK_RETRIES + 1):
+            if attempt:
+                self.stats.count("retries")
+                await asyncio.sleep(BLOCK_RETRY_DELAY * attempt)
             try:
-                client.close()   # your build’s close() is sync; don’t await
-            except Exception:
+                # one request per turn: other devices on the gateway get theirs in between
+                async with self._hub.transport(self._unit_id, priority, deadline):
+                    client = await self._hub.async_client(self.stats)
+                    started = time.perf_counter()
+                    # IMPORTANT: keep using device_id as you requested
+                    result = await self._read_function(client)(
+                        address=block.start, count=block.count, device_id=self._unit_id
+                    )
+                    self.stats.add_request(
+                        f"{block.start}+{block.count}", time.perf_counter() - started
+                    )
+            except (RuntimeError, RequestDeferred):
+                # no connection (reconnect backoff) or out of time: retrying
+                # now is pointless
+                raise
+            except Exception as err:  # pylint: disable=broad-except
+                # dropped socket: reconnect for the retry; an unanswered
+                # transaction is retried on the same socket
+                if _connection_lost(err):
+                    self._close_client()
+                result = err
+                continue
+            if not result.isError():
+                return result
+            if getattr(result, "exception_code", None) not in RETRY_EXCEPTION_CODES:
+                return result  # the device means it; retrying will not help
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    @callback
+    def async_add_register_listener(
+        self, register: int, update_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Call `update_callback` whenever `register`'s value changes."""
+        listeners = self._register_listeners.setdefault(register, [])
+        listeners.append(update_callback)
+        self._subscriptions_changed = True
+        # also hold a base listener: the base class stops scheduling refreshes
+        # once it has no listeners of its own
+        remove_base = self.async_add_listener(lambda: None)
+
+        @callback
+        def remove_listener() -> None:
+            remove_base()
+            listeners.remove(update_callback)
+            if not listeners:
+                self._register_listeners.pop(register, None)
+                self._subscriptions_changed = True
+
+        return remove_listener
+
+    def _publish(self, now: float) -> List[int]:
+        """Copy fresh values into the published view; return registers that changed.
+
+        Applies the deadband / interval rules. Heartbeats (max_interval) count
+        as changes so a flat value never goes silent.
+        """
+        values, published = self._snapshot.values, self._published
+        changed: List[int] = []
+
+        for slot, reg in enumerate(self._snapshot.registers):
+            value = values[slot]
+            if value is None:
+                continue
+            last = published[slot]
+            rules = self._publish_rules.get(reg)
+            if rules is None:
+                if value != last:
+                    published[slot] = value
+                    changed.append(reg)
+                continue
+
+            last_at = self._published_at.get(reg)
+            age = None if last_at is None else now - last_at
+            max_interval = rules.get("max_interval")
+            if age is None or (max_interval is not None and age >= max_interval):
+                # first value, or heartbeat
                 pass
+            elif value != last:
+                deadband = rules.get("deadband", 0)
+                within_band = (
+                    isinstance(value, (int, float)) and isinstance(last, (int, float))
+                    and abs(value - last) <= deadband + 1e-9
+                )
+                too_soon = age < rules.get("min_interval", 0)
+                if within_band or too_soon:
+                    continue
+            else:
+                continue
+
+            published[slot] = value
+            self._published_at[reg] = now
+            changed.append(reg)
+
+        return changed
+
+    def register_offset(self, register: int) -> Optional[int]:
+        """Snapshot slot of `register`, for entities to index values directly."""
+        return self._snapshot.offset(register)
+
+    def published_at_offset(self, offset: int) -> Any:
+        """Published value in snapshot slot `offset`."""
+        return self._published[offset]
+
+    def available_at_offset(self, offset: int, now: Optional[float] = None) -> bool:
+        """Whether slot `offset` holds a value recent enough to show.
+
+        Each register goes stale on its own: after STALE_INTERVALS of its
+        tier's interval without a successful read. Read-once registers never
+        go stale.
+        """
+        age = self._snapshot.age(offset, time.monotonic() if now is None else now)
+        if age is None:
+            return False
+        interval = self._tier_intervals.get(self._slot_tiers[offset])
+        if interval is None:
+            return True
+        return age <= max(STALE_MIN_AGE, STALE_INTERVALS * interval)
+
+    def value_at_offset(self, offset: int) -> Any:
+        """Latest (unfiltered) value in snapshot slot `offset`."""
+        return self._snapshot.values[offset]
+
+    def written_value(self, register: int) -> Any:
+        """Value last written to `register` if it has no snapshot slot (None = never)."""
+        return self._written.get(register)
+
+    def published_value(self, register: int) -> Any:
+        """Value last published to entities (after deadband filtering)."""
+        offset = self._snapshot.offset(register)
+        return None if offset is None else self._published[offset]
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify register listeners whose value changed, then plain listeners."""
+        started = time.perf_counter()
+        changed = self._publish(time.monotonic())
+        available = self.last_update_success
+
+        if available != self._published_available:
+            # availability flips affect every entity
+            changed = list(self._register_listeners)
+        else:
+            notify = set(changed)
+            notify.update(self._written_changed)
+            if self._window_closed:
+                # new window aggregates / energy totals for the sampled registers
+                notify.update(self.sampler.registers)
+            # registers whose own data just went stale or fresh again
+            now = time.monotonic()
+            for reg in self._register_listeners:
+                slot = self._snapshot.offset(reg)
+                if slot is None:
+                    continue
+                fresh = self.available_at_offset(slot, now)
+                if fresh != self._published_fresh[slot]:
+                    self._published_fresh[slot] = fresh
+                    notify.add(reg)
+            changed = list(notify)
+        self._window_closed = False
+        self._written_changed.clear()
+        self._published_available = available
+
+        for reg in changed:
+            for update_callback in list(self._register_listeners.get(reg, ())):
+                update_callback()
+
+        super().async_update_listeners()
+        self.stats.record_dispatch(time.perf_counter() - started)
+
+    async def async_write_register(self, register: int, value: int) -> None:
+        """Write one holding register over the shared connection."""
+        await self.async_write_registers([(register, value)])
+
+    async def async_write_registers(
+        self,
+        steps: Iterable[Tuple[int, int]],
+        verify: bool = True,
+        force: Optional[bool] = None,   # None = the force_writes option
+    ) -> None:
+        """Write an ordered sequence of (register, value) steps.
+
+        Contiguous steps go out as one Write Multiple Registers request; settle
+        delays apply only before registers listed in WRITE_SETTLE_DELAYS. Writes
+        go to the hub at PRIORITY_WRITE, ahead of any queued poll reads, without
+        waiting for a running poll cycle; reads of the written registers that
+        were started before the write are discarded instead of stored.
+
+        Written values are shown optimistically right away; with `verify`, only
+        the written registers are read back and any the device disagrees with
+        are rolled back to what it reports.
+
+        Unless forced, steps whose register the device reported holding the
+        same value within WRITE_DEDUP_MAX_AGE are skipped; if none are left,
+        nothing goes on the bus.
+        """
+        steps = [(int(register), int(value)) for register, value in steps]
+        if not (self.force_writes if force is None else force):
+            steps = self._drop_redundant_writes(steps)
+            if not steps:
+                return
+        batches = plan_write_batches(steps, WRITE_SETTLE_DELAYS)
+        written = dict(steps)  # last value per register wins
+
+        async with self._write_lock:
+            for batch in batches:
+                if batch.delay:
+                    await asyncio.sleep(batch.delay)
+                await self._async_write_batch(batch)
+                self._write_epoch += 1
+                for reg in range(batch.start, batch.start + len(batch.values)):
+                    self._register_epochs[reg] = self._write_epoch
+                    # unknown again until read back
+                    self._confirmed.pop(reg, None)
+
+            self._apply_raw(written)
+            if verify:
+                await self._async_verify_writes(written)
+
+    def _drop_redundant_writes(self, steps: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Steps left after dropping those that would not change the device."""
+        now = time.monotonic()
+        # value each register holds at this point of the sequence, if known
+        expected: Dict[int, Optional[int]] = {}
+        kept: List[Tuple[int, int]] = []
+        for register, value in steps:
+            if register not in expected:
+                expected[register] = self._device_word(register, now)
+            if expected[register] != value:
+                kept.append((register, value))
+            expected[register] = value
+        if len(kept) < len(steps):
+            self.stats.count("writes_skipped", len(steps) - len(kept))
+            _LOGGER.debug(
+                "Skipping writes the device already holds: %s",
+                [step for step in steps if step not in kept],
+            )
+        return kept
+
+    def _device_word(self, register: int, now: float) -> Optional[int]:
+        """Raw word the device last reported for `register`, if recent enough."""
+        candidates: List[Tuple[float, int]] = []
+        age = self._snapshot.word_age(register, now)
+        if age is not None:
+            candidates.append((age, self._snapshot.word(register)))
+        confirmed = self._confirmed.get(register)
+        if confirmed is not None:
+            candidates.append((now - confirmed[1], confirmed[0]))
+        if not candidates:
+            return None
+        age, word = min(candidates)
+        return word if age <= WRITE_DEDUP_MAX_AGE else None
+
+    def _apply_raw(self, raw: Dict[int, int]) -> None:
+        """Merge single-word raw values into the cache and publish them."""
+        raw = {
+            reg: value for reg, value in raw.items()
+            if register_width(REGISTER_LIST.get(reg)) == 1
+        }
+        if not raw:
+            return
+        for block in plan_read_blocks(raw, max_gap=0):
+            words = [raw[reg] for reg in block.registers]
+            decoded = BlockDecoder(block, REGISTER_LIST).decode_values(words)
+            for reg, word, value in zip(block.registers, words, decoded):
+                if self._snapshot.offset(reg) is None:
+                    self._written[reg] = value
+                    self._written_changed.add(reg)
+                    continue
+                self._snapshot.set_word(reg, word)
+                self._snapshot.set_value(reg, value)
+        self.data = self._snapshot
+        self.async_update_listeners()
+
+    async def _async_verify_writes(self, written: Dict[int, int]) -> None:
+        """Read back just the written registers. Caller holds the write lock."""
+        actual: Dict[int, int] = {}
+        try:
+            for block in plan_read_blocks(written, max_gap=0):
+                async with self._hub.transport(self._unit_id, PRIORITY_WRITE):
+                    client = await self._hub.async_client(self.stats)
+                    rr = await self._read_function(client)(
+                        address=block.start, count=block.count, device_id=self._unit_id
+                    )
+                if rr.isError():
+                    raise RuntimeError(f"block {block.start}+{block.count}: {rr}")
+                words = block.slice(rr.registers)
+                actual.update(words)
+                now = time.monotonic()
+                for reg, word in words.items():
+                    self._confirmed[reg] = (word, now)
+        except Exception as err:
+            if _connection_lost(err):
+                self._close_client()
+            # Keep the optimistic values; the next scheduled poll confirms them
+            _LOGGER.debug("Write read-back failed (%s); keeping optimistic values", err)
+            return
+
+        mismatched = {reg: v for reg, v in actual.items() if v != written[reg]}
+        if mismatched:
+            _LOGGER.warning(
+                "Device did not accept writes %s; rolling back to %s",
+                {reg: written[reg] for reg in mismatched}, mismatched,
+            )
+            self._apply_raw(mismatched)
+
+    async def _async_write_batch(self, batch: WriteBatch) -> None:
+        """Send one batch (FC06 for a single word, FC16 otherwise). Caller holds the write lock."""
+        target = (
+            f"register {batch.start}"
+            if len(batch.values) == 1
+            else f"registers {batch.start}-{batch.start + len(batch.values) - 1}"
+        )
+        started = time.perf_counter()
+        try:
+            async with self._hub.transport(self._unit_id, PRIORITY_WRITE):
+                client = await self._hub.async_client(self.stats)
+                if len(batch.values) == 1:
+                    rr = await client.write_register(
+                        address=batch.start, value=batch.values[0], device_id=self._unit_id
+                    )
+                else:
+                    rr = await client.write_registers(
+                        address=batch.start, values=list(batch.values),
+                        device_id=self._unit_id,
+                    )
+        except Exception as err:
+            if _connection_lost(err):
+                self._close_client()
+            self.stats.count("errors")
+            raise HomeAssistantError(
+                f"Error writing {list(batch.values)} to {target}: {err}"
+            ) from err
+
+        self.stats.add_request(
+            f"write {batch.start}+{len(batch.values)}", time.perf_counter() - started
+        )
+        if rr.isError():
+            raise HomeAssistantError(f"Error writing {list(batch.values)} to {target}: {rr}")
+        _LOGGER.debug("Wrote %s to %s", list(batch.values), target)
 
     @property
     def registers(self) -> List[int]:
-        return self._registers
\ No newline at end of file
+        """Configured registers minus those the device does not serve."""
+        return [reg for reg in self._registers if reg not in self._invalid]
+
+    @property
+    def active_registers(self) -> List[int]:
+        """Registers actually polled: served, configured and backing an enabled entity."""
+        return [
+            reg for reg in self.registers
+            if self._wanted is None or reg in self._wanted
+        ]
+
+    def open_breakers(self) -> List[Tuple[Tuple[int, int], float]]:
+        """(start, count) of paused blocks and seconds until their next trial."""
+        return self._breakers.open(time.monotonic())
+
+    @property
+    def blocks(self) -> List[ReadBlock]:
+        return [block for blocks in self._tier_blocks.values() for block in blocks]
+    @property
+    def tier_blocks(self) -> Dict[str, List[ReadBlock]]:
+        """Planned read blocks per poll class (do not modify)."""
+        return self._tier_blocks
+
+    @property
+    def hub(self) -> ModbusHub:
+        """Transport this coordinator's requests go through."""
+        return self._hub
+
+    def mark_tiers_due(self, tiers: Optional[Iterable[str]] = None) -> None:
+        """Make the next cycle read exactly `tiers` (None = every tier).
+
+        For tools and tests driving cycles by hand: tiers left out are not
+        due again until marked, and sampling reads only ride along with the
+        blocks of marked tiers.
+        """
+        if tiers is None:
+            self._tier_due = dict.fromkeys(self._tier_due, 0.0)
+            self._sample_due = 0.0
+            return
+        tiers = set(tiers)
+        self._tier_due = {
+            tier: 0.0 if tier in tiers else float("inf") for tier in self._tier_due
+        }
+        self._sample_due = float("inf")
+
+    async def async_poll_once(self) -> RegisterSnapshot:
+        """Run one poll cycle now and notify listeners, outside the refresh schedule.
+
+        Raises UpdateFailed like a scheduled cycle would; listeners are
+        notified either way.
+        """
+        try:
+            self.data = await self._async_update_data()
+            self.last_update_success = True
+        except UpdateFailed:
+            self.last_update_success = False
+            raise
+        finally:
+            self.async_update_listeners()
+        return self.data
@@ -0,0 +1,35 @@
+"""Diagnostics support for Eaton xStorage Hybrid."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+# the title and unique ID contain the host too
+TO_REDACT = {CONF_HOST, "title", "unique_id"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return poll instrumentation and the current snapshot for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "blocks": [
+            {"start": block.start, "count": block.count, "registers": list(block.registers)}
+            for block in coordinator.blocks
+        ],
+        "stats": coordinator.stats.as_dict(),
+        "open_breakers": [
+            {"start": start, "count": count, "retry_in_s": remaining}
+            for (start, count), remaining in coordinator.open_breakers()
+        ],
+        "data": dict(coordinator.data or {}),
+    }
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from homeassistant.helpers.update_coordinator import BaseCoordinatorEntity, CoordinatorEntity
+
+from .coordinator import ModbusCoordinator
+
+
+class ModbusRegisterEntity(CoordinatorEntity[ModbusCoordinator]):
+    """Coordinator entity bound to one register.
+
+    Subscribes to that register only, so it writes state when its own value
+    changes rather than on every poll.
+    """
+
+    def __init__(self, coordinator: ModbusCoordinator, register: int) -> None:
+        super().__init__(coordinator)
+        self._register = register
+        # slot in the coordinator's snapshot, fixed for its lifetime
+        # (None if the register is not configured)
+        self._offset: Optional[int] = coordinator.register_offset(register)
+
+    @property
+    def available(self) -> bool:
+        # this register's own data, not the whole poll cycle, decides; a
+        # register that is not polled (write-only, or its group deselected)
+        # follows the link
+        if self._offset is None:
+            return self.coordinator.last_update_success
+        return self.coordinator.available_at_offset(self._offset)
+
+    @property
+    def _published_value(self) -> Any:
+        """Deadband-filtered value, as shown in state."""
+        if self._offset is None:
+            return None
+        return self.coordinator.published_at_offset(self._offset)
+
+    @property
+    def _current_value(self) -> Any:
+        """Latest value read or written (unfiltered)."""
+        if self._offset is None:
+            # not polled: only writes and their read-backs set it
+            return self.coordinator.written_value(self._register)
+        return self.coordinator.value_at_offset(self._offset)
+
+    async def async_added_to_hass(self) -> None:
+        # Skip BaseCoordinatorEntity's hook (it adds the catch-all listener)
+        # but keep the rest of the chain, e.g. RestoreEntity's; subscribe per
+        # register instead
+        await super(BaseCoordinatorEntity, self).async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_register_listener(
+                self._register, self._handle_coordinator_update
+            )
+        )
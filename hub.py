@@ -0,0 +1,334 @@
+"""Shared Modbus TCP transport for every device behind one gateway.
+
+WiFi dongles accept a single TCP session. Parallel inverters (Parallel Enable
+3274, Parallel Address 3275 = unit 1-4) and any other config entry pointing at
+the same host therefore share one hub: one connection, one reconnect backoff,
+and a scheduler that hands the link out by priority (user writes, then fast-tier
+reads, then bulk reads) and round-robin across devices within a class, so a
+long poll of one inverter cannot starve the others and a button press never
+waits behind a bulk read. Gateways that passed the
+pipelining probe get several requests in flight at once over
+PipelinedModbusClient, which matches responses by transaction ID (pymodbus
+runs one transaction at a time per client).
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+import logging
+import random
+import time
+from typing import AsyncIterator, Callable, Deque, Dict, Hashable, Optional, Tuple, Union
+
+from homeassistant.core import HomeAssistant
+from pymodbus.client import AsyncModbusTcpClient
+
+from .const import DOMAIN
+from .pipeline import PipelinedModbusClient
+from .recorder import RecordingClient, ReplayClient, TrafficRecorder
+from .stats import PollStats
+
+_LOGGER = logging.getLogger(__name__)
+
+# hass.data[DOMAIN] key holding the hubs, by (host, port)
+HUBS = "hubs"
+
+# Reconnect backoff: base * 2^attempt, capped, with +/- jitter
+RECONNECT_BACKOFF_BASE = 1.0  # seconds
+RECONNECT_BACKOFF_MAX = 300.0  # seconds
+RECONNECT_JITTER = 0.25  # fraction of the delay
+
+ModbusClient = Union[
+    AsyncModbusTcpClient, PipelinedModbusClient, RecordingClient, ReplayClient
+]
+
+# Request classes, most urgent first
+PRIORITY_WRITE = 0  # user-initiated writes and their read-back
+PRIORITY_FAST = 1   # fast-tier reads (live power / SoC)
+PRIORITY_BULK = 2   # other tiers, address scans
+
+# Longest a request of each class may queue for the link (s) before it is dropped
+PRIORITY_DEADLINES: Dict[int, float] = {
+    PRIORITY_WRITE: 30.0,
+    PRIORITY_FAST: 10.0,
+    PRIORITY_BULK: 30.0,
+}
+
+
+class RequestDeferred(Exception):
+    """A queued request outlived its deadline and was dropped before being sent."""
+
+
+class FairSemaphore:
+    """Semaphore granted by priority class first, then round-robin across keys.
+
+    Within one priority class every key gets one turn before any key gets a
+    second; within a key, waiters are served FIFO.
+    """
+
+    def __init__(self, value: int = 1) -> None:
+        self.value = max(1, value)
+        self._in_use = 0
+        self._waiters: Dict[Tuple[int, Hashable], Deque[asyncio.Future]] = {}
+        # keys waiting, per priority class
+        self._order: Dict[int, Deque[Hashable]] = {}
+
+    @property
+    def locked(self) -> bool:
+        return self._in_use >= self.value
+
+    async def acquire(self, key: Hashable, priority: int = 0) -> None:
+        if self._in_use < self.value and not any(self._order.values()):
+            self._in_use += 1
+            return
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault((priority, key), deque()).append(future)
+        order = self._order.setdefault(priority, deque())
+        if key not in order:
+            order.append(key)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # granted just as we were cancelled: pass the turn on
+                self.release()
+            raise
+
+    def release(self) -> None:
+        if self._in_use > self.value:
+            # window shrunk: retire this slot instead of handing it on
+            self._in_use -= 1
+            return
+        for priority in sorted(self._order):
+            order = self._order[priority]
+            while order:
+                key = order.popleft()
+                queue = self._waiters.get((priority, key))
+                while queue and queue[0].done():  # cancelled waiters
+                    queue.popleft()
+                if not queue:
+                    self._waiters.pop((priority, key), None)
+                    continue
+                future = queue.popleft()
+                if queue:
+                    order.append(key)  # back of the line for its next turn
+                else:
+                    del self._waiters[(priority, key)]
+                future.set_result(None)  # the slot passes on without being freed
+                return
+        self._in_use -= 1
+
+
+class ModbusHub:
+    """One connection to a gateway, shared by every unit ID behind it."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        timeout: float = 2.0,
+        request_gap: float = 0.0,   # idle time the gateway needs between frames (s)
+        max_in_flight: int = 1,   # concurrent requests (1 = no pipelining)
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.request_gap = request_gap
+
+        # long-lived connection, reopened with backoff when it drops
+        self._client: Optional[ModbusClient] = None
+        self._reconnect_attempts = 0
+        self._next_connect_at = 0.0
+        self._ever_connected = False
+
+        self._scheduler = FairSemaphore(max_in_flight)
+        # pipelined requests must not each open their own connection
+        self._connect_lock = asyncio.Lock()
+        self._last_request_at = 0.0
+        self.users = 0
+
+        # opt-in capture of every connect / request / response (see recorder.py)
+        self.recorder: Optional[TrafficRecorder] = None
+        # stands in for the real client, e.g. ReplayTransport.client
+        self.client_factory: Optional[Callable[[], ModbusClient]] = None
+
+    @property
+    def max_in_flight(self) -> int:
+        return self._scheduler.value
+
+    @max_in_flight.setter
+    def max_in_flight(self, value: int) -> None:
+        self._scheduler.value = max(1, value)
+
+    def set_recorder(self, recorder: Optional[TrafficRecorder]) -> None:
+        """Start (or stop) capturing; the connection reopens through the recorder."""
+        self.recorder = recorder
+        self.close()
+
+    @asynccontextmanager
+    async def transport(
+        self,
+        unit_id: Hashable,
+        priority: int = PRIORITY_BULK,
+        deadline: Optional[float] = None,   # monotonic time the request must start by
+    ) -> AsyncIterator[None]:
+        """Hold one in-flight slot for one request (or one indivisible exchange).
+
+        Raises RequestDeferred, without sending anything, if the slot is not
+        granted within the class deadline or by `deadline`.
+        """
+        timeout = PRIORITY_DEADLINES[priority]
+        if deadline is not None:
+            timeout = min(timeout, deadline - time.monotonic())
+        if timeout <= 0:
+            raise RequestDeferred("Cycle budget exhausted")
+        try:
+            await asyncio.wait_for(self._scheduler.acquire(unit_id, priority), timeout)
+        except asyncio.TimeoutError as err:
+            raise RequestDeferred(f"No slot on {self.host} within {timeout:.1f}s") from err
+        try:
+            if self.request_gap:
+                # gap after the latest request start or completion
+                wait = self._last_request_at + self.request_gap - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                self._last_request_at = time.monotonic()
+            yield
+        finally:
+            self._last_request_at = time.monotonic()
+            self._scheduler.release()
+
+    async def async_client(self, stats: Optional[PollStats] = None) -> ModbusClient:
+        """Return a healthy client, reconnecting (with backoff) if needed."""
+        client = self._client
+        if client is not None and getattr(client, "connected", False):
+            return client
+        async with self._connect_lock:
+            return await self._async_connect(stats)
+
+    async def _async_connect(self, stats: Optional[PollStats]) -> ModbusClient:
+        client = self._client
+        if client is not None and getattr(client, "connected", False):
+            return client  # another request reconnected while we waited
+
+        if client is not None:
+            # Stale socket: drop it before opening a new one
+            self.close()
+
+        now = time.monotonic()
+        if now < self._next_connect_at:
+            raise RuntimeError(
+                f"Reconnect backoff active for {self._next_connect_at - now:.1f}s"
+            )
+
+        if self.client_factory is not None:
+            client: ModbusClient = self.client_factory()
+        elif self.max_in_flight > 1:
+            client = PipelinedModbusClient(
+                self.host, port=self.port, timeout=self.timeout
+            )
+        else:
+            # reconnect_delay=0, retries=0: we own the reconnect and retry
+            # policy (BLOCK_RETRIES), not pymodbus
+            client = AsyncModbusTcpClient(
+                self.host, port=self.port, timeout=self.timeout,
+                reconnect_delay=0, retries=0,
+            )
+        if self.recorder is not None:
+            client = RecordingClient(client, self.recorder)
+        if self._reconnect_attempts and stats is not None:
+            stats.count("retries")
+        started = time.perf_counter()
+        try:
+            connected = await client.connect()
+        except Exception:
+            connected = False
+        if stats is not None:
+            stats.add_phase("connect", time.perf_counter() - started)
+
+        if not connected and not getattr(client, "connected", False):
+            try:
+                client.close()
+            except Exception:
+                pass
+            self._schedule_reconnect()
+            raise RuntimeError("Unable to open Modbus TCP connection")
+
+        if self._reconnect_attempts:
+            _LOGGER.info("Reconnected to %s:%s", self.host, self.port)
+        if (self._reconnect_attempts or self._ever_connected) and stats is not None:
+            stats.count("reconnects")
+        self._ever_connected = True
+        self._reconnect_attempts = 0
+        self._next_connect_at = 0.0
+        self._client = client
+        return client
+
+    def _schedule_reconnect(self) -> None:
+        """Push the next connect attempt out by an exponential, jittered delay."""
+        delay = min(
+            RECONNECT_BACKOFF_MAX,
+            RECONNECT_BACKOFF_BASE * (2 ** self._reconnect_attempts),
+        )
+        delay *= 1 + random.uniform(-RECONNECT_JITTER, RECONNECT_JITTER)
+        self._reconnect_attempts += 1
+        self._next_connect_at = time.monotonic() + delay
+        _LOGGER.debug(
+            "Connect to %s:%s failed (attempt %s); retrying in %.1fs",
+            self.host, self.port, self._reconnect_attempts, delay,
+        )
+
+    @property
+    def reconnect_backoff(self) -> float:
+        """Seconds until the next connect attempt is allowed (0 = now)."""
+        return max(0.0, self._next_connect_at - time.monotonic())
+
+    def skip_backoff(self) -> None:
+        """Allow the next connect attempt right away (offline replay, tests)."""
+        self._next_connect_at = 0.0
+
+    def close(self) -> None:
+        """Drop the socket; the next request reconnects."""
+        client, self._client = self._client, None
+        if client is None:
+            return
+        try:
+            client.close()   # your build’s close() is sync; don’t await
+        except Exception:
+            pass
+
+
+def async_get_hub(
+    hass: HomeAssistant,
+    host: str,
+    port: int,
+    timeout: float = 2.0,
+    request_gap: float = 0.0,
+    max_in_flight: int = 1,
+) -> ModbusHub:
+    """Shared hub for host:port, created on first use. Pair with async_release_hub."""
+    hubs: Dict[Tuple[str, int], ModbusHub] = hass.data.setdefault(DOMAIN, {}).setdefault(
+        HUBS, {}
+    )
+    hub = hubs.get((host, port))
+    if hub is None:
+        hub = hubs[(host, port)] = ModbusHub(host, port, timeout, request_gap, max_in_flight)
+    else:
+        # the most conservative settings of all entries sharing the gateway win
+        hub.timeout = max(hub.timeout, timeout)
+        hub.request_gap = max(hub.request_gap, request_gap)
+        hub.max_in_flight = min(hub.max_in_flight, max_in_flight)
+    hub.users += 1
+    return hub
+
+
+def async_release_hub(hass: HomeAssistant, hub: ModbusHub) -> None:
+    """Drop one reference; the last one closes the connection."""
+    hub.users -= 1
+    if hub.users > 0:
+        return
+    hub.close()
+    hubs = hass.data.get(DOMAIN, {}).get(HUBS, {})
+    if hubs.get((hub.host, hub.port)) is hub:
+        del hubs[(hub.host, hub.port)]
@@ -1,12 +1,11 @@
 from __future__ import annotations
 
 from homeassistant.components.number import NumberEntity
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
 from .const import DOMAIN
-from .sync_modbus import write_register_sync
+from .entity import ModbusRegisterEntity
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
@@ -22,7 +21,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     async_add_entities(sliders)
 
 
-class ModbusSliderNumber(CoordinatorEntity, NumberEntity):
+class ModbusSliderNumber(ModbusRegisterEntity, NumberEntity):
     """A slider that writes 0–100 to a Modbus register."""
 
     _attr_native_min_value = 0
@@ -31,23 +30,20 @@ class ModbusSliderNumber(CoordinatorEntity, NumberEntity):
     _attr_mode = "slider"
 
     def __init__(self, hass: HomeAssistant, coordinator, entry_id: str, register: int):
-        super().__init__(coordinator)
+        super().__init__(coordinator, register)
         self.hass = hass
-        self._register = register
         self._attr_name = f"Maximum charge (%)"
         self._attr_unique_id = f"{entry_id}_slider_{register}"
 
     @property
     def native_value(self):
         """Return the current value from the coordinator."""
-        data = self.coordinator.data or {}
-        return data.get(self._register, 0)
+        value = self._current_value
+        return 0 if value is None else value
 
     async def async_set_native_value(self, value: float) -> None:
-        """Write the new slider value to the Modbus register."""
-        await self.hass.async_add_executor_job(
-            write_register_sync, self._register, int(value)
-        )
+        """Write the new slider value to the Modbus register.
 
-        # Refresh sensors after writing
-        await self.coordinator.async_request_refresh()
+        The coordinator shows it optimistically and reads back only this register.
+        """
+        await self.coordinator.async_write_register(self._register, int(value))
@@ -0,0 +1,162 @@
+"""Minimal Modbus TCP client with pipelined transactions.
+
+pymodbus runs one transaction at a time per client (its transaction manager
+holds a lock across request and response), so overlapping requests need their
+own framing. Each request here gets its own transaction ID and is written
+without waiting for earlier responses; a reader task resolves every response
+to its request by that ID. How many are outstanding at once is up to the
+caller (the hub's in-flight window).
+
+Only the calls the coordinator makes are implemented, returning objects with
+the same surface as pymodbus responses (`isError()`, `registers`,
+`exception_code`).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import struct
+from typing import Dict, List, Optional, Sequence
+
+_LOGGER = logging.getLogger(__name__)
+
+# MBAP header: transaction ID, protocol ID (0), length, unit ID
+_MBAP = struct.Struct(">HHHB")
+
+
+class ModbusResponse:
+    """Decoded response PDU."""
+
+    def __init__(
+        self,
+        function_code: int,
+        registers: Optional[List[int]] = None,
+        exception_code: Optional[int] = None,
+    ) -> None:
+        self.function_code = function_code
+        self.registers = registers or []
+        self.exception_code = exception_code
+
+    def isError(self) -> bool:  # noqa: N802 - pymodbus naming
+        return self.exception_code is not None
+
+    def __str__(self) -> str:
+        if self.isError():
+            return f"Exception Response({self.function_code}, {self.exception_code})"
+        return f"Response({self.function_code}, {len(self.registers)} registers)"
+
+
+def _parse_pdu(pdu: bytes) -> ModbusResponse:
+    function = pdu[0]
+    if function & 0x80:
+        return ModbusResponse(function & 0x7F, exception_code=pdu[1] if len(pdu) > 1 else 0)
+    if function in (0x03, 0x04):
+        count = pdu[1] // 2
+        return ModbusResponse(function, list(struct.unpack_from(f">{count}H", pdu, 2)))
+    return ModbusResponse(function)  # write echo
+
+
+class PipelinedModbusClient:
+    """Modbus TCP client allowing several outstanding transactions."""
+
+    def __init__(self, host: str, port: int = 502, timeout: float = 2.0) -> None:
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._read_task: Optional[asyncio.Task] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._next_tid = 0
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def connect(self) -> bool:
+        try:
+            self._reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), self.timeout
+            )
+        except (OSError, asyncio.TimeoutError) as err:
+            _LOGGER.debug("Connect to %s:%s failed: %s", self.host, self.port, err)
+            return False
+        self._read_task = asyncio.get_running_loop().create_task(self._read_loop())
+        return True
+
+    def close(self) -> None:
+        """Drop the socket and fail every outstanding request (sync, like pymodbus)."""
+        if self._read_task is not None:
+            self._read_task.cancel()
+            self._read_task = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self._fail_pending(ConnectionError("Connection closed"))
+
+    def _fail_pending(self, err: Exception) -> None:
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(err)
+
+    async def _read_loop(self) -> None:
+        reader = self._reader
+        assert reader is not None
+        try:
+            while True:
+                tid, _, length, _ = _MBAP.unpack(await reader.readexactly(_MBAP.size))
+                pdu = await reader.readexactly(length - 1)
+                future = self._pending.pop(tid, None)
+                if future is None or future.done():
+                    continue  # late answer to a request that timed out
+                try:
+                    future.set_result(_parse_pdu(pdu))
+                except (IndexError, struct.error) as err:
+                    future.set_exception(ConnectionError(f"Malformed response: {err}"))
+        except asyncio.CancelledError:
+            raise
+        except (asyncio.IncompleteReadError, OSError, ValueError) as err:
+            # ValueError: a malformed MBAP length; the stream cannot be
+            # resynchronised, so drop it like a lost connection
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            self._fail_pending(ConnectionError(f"Connection lost: {err}"))
+
+    async def _execute(self, unit: int, pdu: bytes) -> ModbusResponse:
+        if not self.connected:
+            raise ConnectionError("Not connected")
+        self._next_tid = self._next_tid % 0xFFFF + 1
+        tid = self._next_tid
+        future = asyncio.get_running_loop().create_future()
+        self._pending[tid] = future
+        try:
+            self._writer.write(_MBAP.pack(tid, 0, len(pdu) + 1, unit) + pdu)
+            await self._writer.drain()
+            return await asyncio.wait_for(future, self.timeout)
+        finally:
+            self._pending.pop(tid, None)
+
+    async def read_input_registers(
+        self, address: int, count: int = 1, device_id: int = 1
+    ) -> ModbusResponse:
+        return await self._execute(device_id, struct.pack(">BHH", 0x04, address, count))
+
+    async def read_holding_registers(
+        self, address: int, count: int = 1, device_id: int = 1
+    ) -> ModbusResponse:
+        return await self._execute(device_id, struct.pack(">BHH", 0x03, address, count))
+
+    async def write_register(
+        self, address: int, value: int, device_id: int = 1
+    ) -> ModbusResponse:
+        return await self._execute(device_id, struct.pack(">BHH", 0x06, address, value))
+
+    async def write_registers(
+        self, address: int, values: Sequence[int], device_id: int = 1
+    ) -> ModbusResponse:
+        pdu = struct.pack(
+            f">BHHB{len(values)}H", 0x10, address, len(values), 2 * len(values), *values
+        )
+        return await self._execute(device_id, pdu)
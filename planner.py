@@ -0,0 +1,128 @@
+"""Read and write planning for the xStorage Modbus map.
+
+Turns a set of register addresses into a small number of contiguous block
+reads, so a poll costs a handful of round trips instead of one per register,
+and packs write sequences into Write Multiple Registers batches.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Collection, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+# Modbus spec limit for a single Read Holding/Input Registers PDU
+MAX_READ_COUNT = 125
+
+# Modbus spec limit for a single Write Multiple Registers PDU
+MAX_WRITE_COUNT = 123
+
+# Unwanted words we are willing to read to avoid a separate request
+DEFAULT_MAX_GAP = 8
+
+
+@dataclass(frozen=True)
+class ReadBlock:
+    """One contiguous read: `count` words starting at `start`."""
+
+    start: int
+    count: int
+    registers: Tuple[int, ...]
+
+    @property
+    def end(self) -> int:
+        """Last address covered by this block (inclusive)."""
+        return self.start + self.count - 1
+
+    def slice(self, words: Sequence[int]) -> Dict[int, int]:
+        """Map a block response back to {register: value} for the wanted registers."""
+        if len(words) < self.count:
+            raise ValueError(
+                f"Short response for block {self.start}+{self.count}: got {len(words)} words"
+            )
+        return {reg: words[reg - self.start] for reg in self.registers}
+
+
+def plan_read_blocks(
+    registers: Iterable[int],
+    max_count: int = MAX_READ_COUNT,
+    max_gap: int = DEFAULT_MAX_GAP,
+    widths: Optional[Mapping[int, int]] = None,
+    invalid: Optional[Collection[int]] = None,
+) -> List[ReadBlock]:
+    """Group registers into contiguous blocks.
+
+    Neighbouring registers are merged while the hole between them is at most
+    `max_gap` words and the resulting block stays within `max_count` words.
+    `widths` gives the number of words a register spans (U32, ASCII); a
+    multi-word value is never split across two blocks. A hole containing an
+    `invalid` address (one the device rejects) is never bridged.
+    """
+    max_count = max(1, min(int(max_count), MAX_READ_COUNT))
+    max_gap = max(0, int(max_gap))
+    widths = widths or {}
+    invalid = invalid or ()
+
+    blocks: List[ReadBlock] = []
+    current: List[int] = []
+    start = end = 0
+
+    for reg in sorted(set(registers)):
+        reg_end = reg + max(1, widths.get(reg, 1)) - 1
+        if current:
+            gap = reg - end - 1
+            span = max(end, reg_end) - start + 1
+            bridges_invalid = gap > 0 and any(
+                address in invalid for address in range(end + 1, reg)
+            )
+            if gap <= max_gap and span <= max_count and not bridges_invalid:
+                current.append(reg)
+                end = max(end, reg_end)
+                continue
+            blocks.append(_make_block(current, start, end))
+        current = [reg]
+        start, end = reg, reg_end
+
+    if current:
+        blocks.append(_make_block(current, start, end))
+    return blocks
+
+
+def _make_block(registers: List[int], start: int, end: int) -> ReadBlock:
+    return ReadBlock(start=start, count=end - start + 1, registers=tuple(registers))
+
+
+@dataclass(frozen=True)
+class WriteBatch:
+    """Consecutive register writes sent as one request, after `delay` seconds."""
+
+    start: int
+    values: Tuple[int, ...]
+    delay: float = 0.0
+
+
+def plan_write_batches(
+    steps: Iterable[Tuple[int, int]],
+    settle_delays: Optional[Mapping[int, float]] = None,
+) -> List[WriteBatch]:
+    """Group an ordered write sequence into Write Multiple Registers batches.
+
+    Steps keep their order. A step joins the previous batch when it targets the
+    next address and the device needs no settle time before it
+    (`settle_delays`); otherwise it starts a new batch carrying that delay.
+    """
+    settle_delays = settle_delays or {}
+    batches: List[WriteBatch] = []
+    start, values, delay = 0, [], 0.0
+
+    for register, value in steps:
+        wait = float(settle_delays.get(register, 0.0))
+        contiguous = values and register == start + len(values)
+        if contiguous and not wait and len(values) < MAX_WRITE_COUNT:
+            values.append(int(value))
+            continue
+        if values:
+            batches.append(WriteBatch(start=start, values=tuple(values), delay=delay))
+        start, values, delay = register, [int(value)], wait
+
+    if values:
+        batches.append(WriteBatch(start=start, values=tuple(values), delay=delay))
+    return batches
@@ -0,0 +1,155 @@
+"""One-off gateway probe run by the config flow.
+
+Cheap WiFi Modbus dongles differ in the largest read they accept, whether they
+cope with overlapping transactions and how much idle time they need between
+frames. The probe measures these once so the coordinator can start with tuned
+transport parameters instead of conservative guesses.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import statistics
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from pymodbus.client import AsyncModbusTcpClient
+
+from .pipeline import PipelinedModbusClient
+from .planner import MAX_READ_COUNT
+
+_LOGGER = logging.getLogger(__name__)
+
+# First register of the map; every probe read starts here
+PROBE_ADDRESS = 3000
+
+# Read sizes tried, largest first
+PROBE_COUNTS = (MAX_READ_COUNT, 100, 64, 32, 16, 8, 1)
+
+# Idle gaps (seconds) tried between back-to-back requests, shortest first
+PROBE_GAPS = (0.0, 0.05, 0.1, 0.2, 0.5)
+
+# Back-to-back requests per gap trial
+PROBE_BURST = 4
+
+# A word in the span is not served: the request (and its size) went through
+ILLEGAL_DATA_ADDRESS = 0x02
+
+# Keys of the "transport" dict stored in the config entry
+TRANSPORT_RTT = "rtt"
+TRANSPORT_MAX_READ_COUNT = "max_read_count"
+TRANSPORT_REQUEST_GAP = "request_gap"
+TRANSPORT_READ_INPUT = "read_input"
+TRANSPORT_PIPELINING = "pipelining"
+
+
+class ProbeError(Exception):
+    """The gateway could not be reached or did not answer any read."""
+
+
+async def _read_ok(
+    read, address: int, count: int, unit_id: int, accept: Tuple[int, ...] = ()
+) -> bool:
+    """True if the read succeeds or fails with one of the `accept` exception codes."""
+    try:
+        rr = await read(address=address, count=count, device_id=unit_id)
+    except Exception:  # timeouts and dropped frames count as "no"
+        return False
+    return not rr.isError() or getattr(rr, "exception_code", None) in accept
+
+
+async def async_probe_gateway(
+    host: str, port: int, unit_id: int = 1, timeout: float = 2.0
+) -> Dict[str, Any]:
+    """Measure RTT, max read size, safe request gap, function code and pipelining."""
+    # retries=0: each probe request is sent once, so a dead link fails in `timeout`
+    client = AsyncModbusTcpClient(
+        host, port=port, timeout=timeout, reconnect_delay=0, retries=0
+    )
+    try:
+        if not await client.connect() and not getattr(client, "connected", False):
+            raise ProbeError(f"Unable to open Modbus TCP connection to {host}:{port}")
+
+        # Which function code answers: input (3xxxx) preferred, holding as fallback
+        read_input = True
+        read = client.read_input_registers
+        if not await _read_ok(read, PROBE_ADDRESS, 1, unit_id):
+            read_input = False
+            read = client.read_holding_registers
+            if not await _read_ok(read, PROBE_ADDRESS, 1, unit_id):
+                raise ProbeError("Device answered neither input nor holding register reads")
+
+        # RTT: median of a few single-register reads
+        samples = []
+        for _ in range(3):
+            started = time.perf_counter()
+            if await _read_ok(read, PROBE_ADDRESS, 1, unit_id):
+                samples.append(time.perf_counter() - started)
+        rtt = statistics.median(samples) if samples else timeout
+
+        # Largest block the gateway (and device) accepts; gaps in the map
+        # (Illegal Data Address) are the address scan's business, not a size limit
+        max_count = 1
+        for count in PROBE_COUNTS:
+            if await _read_ok(read, PROBE_ADDRESS, count, unit_id, (ILLEGAL_DATA_ADDRESS,)):
+                max_count = count
+                break
+
+        # Shortest idle gap that survives a burst of back-to-back requests
+        gap = PROBE_GAPS[-1]
+        for candidate in PROBE_GAPS:
+            ok = True
+            for _ in range(PROBE_BURST):
+                if candidate:
+                    await asyncio.sleep(candidate)
+                if not await _read_ok(read, PROBE_ADDRESS, 1, unit_id):
+                    ok = False
+                    break
+            if ok:
+                gap = candidate
+                break
+
+    finally:
+        try:
+            client.close()
+        except Exception:
+            pass
+
+    # Overlapping transactions: pymodbus would serialize them, so use our own
+    # client (on a fresh session: the dongle allows only one)
+    await asyncio.sleep(gap)
+    pipelining = await _probe_pipelining(host, port, unit_id, timeout, read_input)
+
+    transport = {
+        TRANSPORT_RTT: round(rtt, 3),
+        TRANSPORT_MAX_READ_COUNT: max_count,
+        TRANSPORT_REQUEST_GAP: gap,
+        TRANSPORT_READ_INPUT: read_input,
+        TRANSPORT_PIPELINING: pipelining,
+    }
+    _LOGGER.info("Gateway %s:%s probe: %s", host, port, transport)
+    return transport
+
+
+async def _probe_pipelining(
+    host: str, port: int, unit_id: int, timeout: float, read_input: bool
+) -> bool:
+    """Send PROBE_BURST reads without waiting; all must come back intact."""
+    client = PipelinedModbusClient(host, port=port, timeout=timeout)
+    if not await client.connect():
+        return False
+    read = client.read_input_registers if read_input else client.read_holding_registers
+    try:
+        results = await asyncio.gather(
+            *(_read_ok(read, PROBE_ADDRESS + i, 1, unit_id) for i in range(PROBE_BURST))
+        )
+    finally:
+        client.close()
+    return all(results)
+
+
+def transport_timeout(transport: Optional[Dict[str, Any]], default: float = 2.0) -> float:
+    """Request timeout derived from the probed RTT (never below `default`)."""
+    if not transport or TRANSPORT_RTT not in transport:
+        return default
+    return max(default, 5 * float(transport[TRANSPORT_RTT]))
@@ -0,0 +1,306 @@
+"""Modbus traffic capture and deterministic replay.
+
+TrafficRecorder wraps whatever client the hub opens (RecordingClient) and
+logs every connect, request and response with its start time and latency as
+one JSON object per line:
+
+    {"op": "start", "host": "192.168.1.50", "port": 502, "wall": 1760000000.0}
+    {"t": 0.0012, "op": "connect", "lat": 0.0431, "ok": true}
+    {"t": 0.0455, "op": "read_input", "unit": 1, "addr": 3000, "count": 40,
+     "lat": 0.0812, "regs": [...]}
+    {"t": 5.0101, "op": "write", "fc": 6, "unit": 1, "addr": 3086, "values": [2],
+     "lat": 0.0790, "exc": 4}
+    {"t": 9.3318, "op": "read_input", "unit": 1, "addr": 3064, "count": 12,
+     "lat": 2.0004, "err": "TimeoutError", "msg": ""}
+    {"op": "gap", "dropped": 120}
+
+Lines are buffered in memory and appended to the file from the executor, so
+recording never blocks the event loop. If the buffer overflows between
+flushes, the oldest lines are dropped and a "gap" record takes their place.
+
+ReplayTransport serves a capture back through the hub in place of the real
+client: the n-th request for a given (op, unit, address, count/values) gets
+the n-th recorded answer for it, so pipelined captures replay the same way
+whatever order the requests complete in. Connect results replay in order.
+By default answers come back immediately; with `realtime` each one waits its
+recorded latency.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import json
+import logging
+import time
+from typing import Any, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .pipeline import ModbusResponse
+
+_LOGGER = logging.getLogger(__name__)
+
+# Records kept in memory between flushes; the oldest are dropped beyond this
+# (and a gap record written in their place)
+MAX_BUFFERED = 10000
+
+# Capture file name under the HA config directory (host slugified)
+CAPTURE_FILE = "xstorage_hybrid_{host}_{port}.jsonl"
+
+# Function code per recorded op; writes record theirs ("fc": FC06 or FC16)
+_FUNCTION_CODES = {"read_holding": 0x03, "read_input": 0x04, "write": 0x10}
+
+
+class ReplayMismatch(ConnectionError):
+    """A replayed request has no (more) recorded answer."""
+
+
+def _request_key(record: Dict[str, Any]) -> Tuple:
+    values = record.get("values")
+    return (
+        record["op"],
+        record.get("unit"),
+        record.get("addr"),
+        record.get("count") if values is None else tuple(values),
+    )
+
+
+class TrafficRecorder:
+    """Buffers capture records and appends them to a JSONL file."""
+
+    def __init__(self, path: str, host: str = "", port: int = 0) -> None:
+        self.path = path
+        self._started = time.monotonic()
+        self._buffer: Deque[str] = deque(maxlen=MAX_BUFFERED)
+        # records dropped from the full buffer since the last flush
+        self._dropped = 0
+        self.record({"op": "start", "host": host, "port": port, "wall": time.time()})
+
+    def record(self, entry: Dict[str, Any]) -> None:
+        if len(self._buffer) == MAX_BUFFERED:
+            if not self._dropped:
+                _LOGGER.warning(
+                    "Traffic capture buffer full (%s records); dropping the oldest",
+                    MAX_BUFFERED,
+                )
+            self._dropped += 1
+        self._buffer.append(json.dumps(entry, separators=(",", ":")))
+
+    def since_start(self, at: float) -> float:
+        return round(at - self._started, 4)
+
+    def flush(self) -> None:
+        """Append buffered records to the file (blocking: run in the executor)."""
+        if not self._buffer:
+            return
+        lines = []
+        dropped, self._dropped = self._dropped, 0
+        if dropped:
+            # the dropped records were older than anything still buffered
+            lines.append(json.dumps({"op": "gap", "dropped": dropped}, separators=(",", ":")))
+        while self._buffer:
+            lines.append(self._buffer.popleft())
+        try:
+            with open(self.path, "a", encoding="utf-8") as capture:
+                capture.write("\n".join(lines) + "\n")
+        except OSError as err:
+            _LOGGER.warning("Could not write traffic capture %s: %s", self.path, err)
+
+
+class RecordingClient:
+    """Client wrapper logging every call to a TrafficRecorder."""
+
+    def __init__(self, client: Any, recorder: TrafficRecorder) -> None:
+        self._client = client
+        self._recorder = recorder
+
+    @property
+    def connected(self) -> bool:
+        return bool(getattr(self._client, "connected", False))
+
+    async def connect(self) -> bool:
+        started = time.monotonic()
+        ok = False
+        try:
+            ok = bool(await self._client.connect())
+            return ok
+        finally:
+            self._recorder.record({
+                "t": self._recorder.since_start(started),
+                "op": "connect",
+                "lat": round(time.monotonic() - started, 4),
+                "ok": ok,
+            })
+
+    def close(self) -> None:
+        self._client.close()
+
+    async def _call(self, entry: Dict[str, Any], request) -> Any:
+        started = time.monotonic()
+        entry["t"] = self._recorder.since_start(started)
+        try:
+            rr = await request
+        except BaseException as err:
+            entry["lat"] = round(time.monotonic() - started, 4)
+            if isinstance(err, asyncio.CancelledError):
+                entry["err"] = "CancelledError"
+            else:
+                entry["err"] = type(err).__name__
+                entry["msg"] = str(err)
+            self._recorder.record(entry)
+            raise
+        entry["lat"] = round(time.monotonic() - started, 4)
+        if rr.isError():
+            entry["exc"] = getattr(rr, "exception_code", None)
+        elif entry["op"] != "write":
+            entry["regs"] = list(getattr(rr, "registers", None) or [])
+        self._recorder.record(entry)
+        return rr
+
+    async def read_input_registers(self, address: int, count: int = 1, device_id: int = 1):
+        return await self._call(
+            {"op": "read_input", "unit": device_id, "addr": address, "count": count},
+            self._client.read_input_registers(
+                address=address, count=count, device_id=device_id
+            ),
+        )
+
+    async def read_holding_registers(self, address: int, count: int = 1, device_id: int = 1):
+        return await self._call(
+            {"op": "read_holding", "unit": device_id, "addr": address, "count": count},
+            self._client.read_holding_registers(
+                address=address, count=count, device_id=device_id
+            ),
+        )
+
+    async def write_register(self, address: int, value: int, device_id: int = 1):
+        return await self._call(
+            {"op": "write", "fc": 0x06, "unit": device_id, "addr": address, "values": [value]},
+            self._client.write_register(address=address, value=value, device_id=device_id),
+        )
+
+    async def write_registers(self, address: int, values: Sequence[int], device_id: int = 1):
+        return await self._call(
+            {"op": "write", "fc": 0x10, "unit": device_id, "addr": address,
+             "values": list(values)},
+            self._client.write_registers(
+                address=address, values=list(values), device_id=device_id
+            ),
+        )
+
+
+def load_capture(path: str) -> List[Dict[str, Any]]:
+    """Parse a capture file (blocking)."""
+    with open(path, encoding="utf-8") as capture:
+        return [json.loads(line) for line in capture if line.strip()]
+
+
+class ReplayTransport:
+    """Recorded answers, shared by every client the hub opens during a replay."""
+
+    def __init__(self, records: Iterable[Dict[str, Any]], realtime: bool = False) -> None:
+        self.realtime = realtime
+        self._connects: Deque[Dict[str, Any]] = deque()
+        self._answers: Dict[Tuple, Deque[Dict[str, Any]]] = {}
+        # records the recorder dropped (gap records); requests made in those
+        # stretches have no answer to replay
+        self.dropped = 0
+        for record in records:
+            if record.get("op") == "connect":
+                self._connects.append(record)
+            elif record.get("op") in _FUNCTION_CODES:
+                self._answers.setdefault(_request_key(record), deque()).append(record)
+            elif record.get("op") == "gap":
+                self.dropped += record.get("dropped", 0)
+        self.replayed = 0
+        self.mismatches = 0
+
+    @property
+    def remaining(self) -> int:
+        """Recorded requests not replayed yet."""
+        return sum(len(answers) for answers in self._answers.values())
+
+    def peek(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Next recorded answer for `request`, without consuming it."""
+        answers = self._answers.get(_request_key(request))
+        return answers[0] if answers else None
+
+    def client(self) -> "ReplayClient":
+        """Client factory for ModbusHub.client_factory."""
+        return ReplayClient(self)
+
+    async def _wait(self, record: Dict[str, Any]) -> None:
+        if self.realtime and record.get("lat"):
+            await asyncio.sleep(record["lat"])
+
+    async def connect(self) -> bool:
+        if not self._connects:
+            return True  # capture started mid-session
+        record = self._connects.popleft()
+        await self._wait(record)
+        return bool(record.get("ok"))
+
+    async def answer(self, request: Dict[str, Any]) -> ModbusResponse:
+        answers = self._answers.get(_request_key(request))
+        if not answers:
+            self.mismatches += 1
+            raise ReplayMismatch(f"No recorded answer for {request}")
+        record = answers.popleft()
+        self.replayed += 1
+        await self._wait(record)
+        if "err" in record:
+            if record["err"] in ("TimeoutError", "CancelledError"):
+                raise asyncio.TimeoutError(record.get("msg", ""))
+            raise ConnectionError(f"{record['err']}: {record.get('msg', '')}")
+        function_code = record.get("fc", _FUNCTION_CODES[record["op"]])
+        if record.get("exc") is not None:
+            return ModbusResponse(function_code, exception_code=record["exc"])
+        return ModbusResponse(function_code, record.get("regs"))
+
+
+class ReplayClient:
+    """Client surface over a ReplayTransport."""
+
+    def __init__(self, transport: ReplayTransport) -> None:
+        self._transport = transport
+        self._connected = False
+
+    @property
+    def connected(self) -> bool:
+        return self._connected
+
+    async def connect(self) -> bool:
+        self._connected = await self._transport.connect()
+        return self._connected
+
+    def close(self) -> None:
+        self._connected = False
+
+    async def _answer(self, request: Dict[str, Any]) -> ModbusResponse:
+        if not self._connected:
+            raise ConnectionError("Not connected")
+        try:
+            return await self._transport.answer(request)
+        except ReplayMismatch:
+            raise
+        except ConnectionError:
+            self._connected = False  # the recorded session dropped here
+            raise
+
+    async def read_input_registers(self, address: int, count: int = 1, device_id: int = 1):
+        return await self._answer(
+            {"op": "read_input", "unit": device_id, "addr": address, "count": count}
+        )
+
+    async def read_holding_registers(self, address: int, count: int = 1, device_id: int = 1):
+        return await self._answer(
+            {"op": "read_holding", "unit": device_id, "addr": address, "count": count}
+        )
+
+    async def write_register(self, address: int, value: int, device_id: int = 1):
+        return await self._answer(
+            {"op": "write", "unit": device_id, "addr": address, "values": [value]}
+        )
+
+    async def write_registers(self, address: int, values: Sequence[int], device_id: int = 1):
+        return await self._answer(
+            {"op": "write", "unit": device_id, "addr": address, "values": list(values)}
+        )
@@ -0,0 +1,56 @@
+"""Last good register snapshot, persisted so startup never waits on the device.
+
+On setup the coordinator is seeded with the values of the previous session,
+static metadata (serial number, model, firmware) included, and entities come
+up with them right away; the first live poll then runs in the background. The
+snapshot is saved with HA's storage helper at most once per SAVE_DELAY and
+flushed on shutdown.
+"""
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+STORAGE_VERSION = 1
+
+# Seconds between snapshot writes while polling
+SAVE_DELAY = 300
+
+
+class SnapshotStore:
+    """Decoded register values of one config entry, keyed by address."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store[Dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.snapshot"
+        )
+        self._pending = False
+        self.saved_at: Optional[float] = None
+
+    async def async_load(self) -> Dict[int, Any]:
+        data = await self._store.async_load() or {}
+        self.saved_at = data.get("saved_at")
+        # JSON object keys come back as strings
+        return {int(reg): value for reg, value in data.get("values", {}).items()}
+
+    @callback
+    def async_schedule_save(self, values_func: Callable[[], Mapping[int, Any]]) -> None:
+        """Save `values_func()` within SAVE_DELAY; later calls until then are no-ops."""
+        if self._pending:
+            return
+        self._pending = True
+
+        def data_func() -> Dict[str, Any]:
+            self._pending = False
+            self.saved_at = time.time()
+            return {"saved_at": self.saved_at, "values": dict(values_func())}
+
+        self._store.async_delay_save(data_func, SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
@@ -0,0 +1,173 @@
+"""Power sampling between publishes.
+
+Battery and PV power are read on every fast-tier cycle (down to the adaptive
+floor) and at least every SAMPLE_INTERVAL however slow that tier gets, but
+their published state changes at most once per window, and only that reaches
+the recorder. Each sample goes
+into a fixed-size ring per register; once per window the ring is reduced to
+min / max / mean, and consecutive samples are integrated with the trapezoid
+rule into running energy totals. Short spikes then show up in the aggregates
+and the energy figures without recording every sample.
+"""
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple
+
+# Samples further apart than this (s) are not integrated: the link was down
+MAX_SAMPLE_GAP = 300.0
+
+# Seconds per hour, for W*s -> Wh
+_HOUR = 3600.0
+
+
+class SampleRing:
+    """Fixed-size ring of (monotonic time, value) samples."""
+
+    def __init__(self, size: int) -> None:
+        self._times = array("d", bytes(8 * size))
+        self._values = array("d", bytes(8 * size))
+        self._size = size
+        self._head = 0  # next write position
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, at: float, value: float) -> None:
+        self._times[self._head] = at
+        self._values[self._head] = value
+        self._head = (self._head + 1) % self._size
+        self._count = min(self._count + 1, self._size)
+
+    def since(self, start: float) -> Iterator[Tuple[float, float]]:
+        """Samples taken at or after `start`, oldest first."""
+        first = (self._head - self._count) % self._size
+        for i in range(self._count):
+            index = (first + i) % self._size
+            if self._times[index] >= start:
+                yield self._times[index], self._values[index]
+
+
+@dataclass(frozen=True)
+class WindowStats:
+    """Aggregates of one register over one publish window."""
+
+    samples: int
+    minimum: float
+    maximum: float
+    mean: float  # time-weighted over the window's samples
+    energy_wh: float  # net trapezoid integral over the window
+
+    def as_attributes(self) -> Dict[str, float]:
+        return {
+            "samples": self.samples,
+            "min": self.minimum,
+            "max": self.maximum,
+            "mean": round(self.mean, 1),
+            "energy_wh": round(self.energy_wh, 3),
+        }
+
+
+def _trapezoid(t0: float, v0: float, t1: float, v1: float) -> Tuple[float, float]:
+    """Positive and negative parts (W*s) of the trapezoid between two samples.
+
+    A sign change is split at the zero crossing so charge and discharge
+    energy never cancel within one step.
+    """
+    dt = t1 - t0
+    if v0 >= 0 and v1 >= 0:
+        return (v0 + v1) / 2 * dt, 0.0
+    if v0 <= 0 and v1 <= 0:
+        return 0.0, -(v0 + v1) / 2 * dt
+    crossing = dt * v0 / (v0 - v1)
+    first, second = v0 / 2 * crossing, v1 / 2 * (dt - crossing)
+    return (first, -second) if v0 > 0 else (second, -first)
+
+
+class PowerSampler:
+    """Ring buffers, window aggregates and energy totals for a few power registers."""
+
+    def __init__(self, registers: Iterable[int], size: int, window: float) -> None:
+        self.window = window
+        self._rings: Dict[int, SampleRing] = {reg: SampleRing(size) for reg in registers}
+        self._last: Dict[int, Tuple[float, float]] = {}
+        self._window_start: Optional[float] = None
+        # running energy per register: (positive Wh, negative Wh)
+        self.energy_wh: Dict[int, Tuple[float, float]] = {
+            reg: (0.0, 0.0) for reg in self._rings
+        }
+        self._window_energy: Dict[int, float] = {reg: 0.0 for reg in self._rings}
+        # window aggregates and running totals as of the last closed window
+        # (what entities publish, so state changes once per window)
+        self.stats: Dict[int, WindowStats] = {}
+        self.published_wh: Dict[int, Tuple[float, float]] = dict(self.energy_wh)
+        self._restored: Set[Tuple[int, bool]] = set()
+
+    @property
+    def registers(self) -> Iterable[int]:
+        return self._rings.keys()
+
+    def add(self, at: float, register: int, value: object) -> None:
+        """Record one sample of `register` read at monotonic time `at`."""
+        ring = self._rings.get(register)
+        if ring is None or not isinstance(value, (int, float)):
+            return
+        if self._window_start is None:
+            self._window_start = at
+        last = self._last.get(register)
+        if last is not None and last[0] >= at:
+            return  # already sampled at this time
+        if last is not None and at - last[0] <= MAX_SAMPLE_GAP:
+            positive, negative = _trapezoid(last[0], last[1], at, float(value))
+            total_pos, total_neg = self.energy_wh[register]
+            self.energy_wh[register] = (
+                total_pos + positive / _HOUR, total_neg + negative / _HOUR
+            )
+            self._window_energy[register] += (positive - negative) / _HOUR
+        ring.append(at, float(value))
+        self._last[register] = (at, float(value))
+
+    def close_window(self, at: float) -> bool:
+        """Aggregate the window if it has elapsed; True when new stats are available."""
+        if self._window_start is None or at - self._window_start < self.window:
+            return False
+        for reg, ring in self._rings.items():
+            samples = list(ring.since(self._window_start))
+            if not samples:
+                self.stats.pop(reg, None)
+                continue
+            values = [value for _, value in samples]
+            span = samples[-1][0] - samples[0][0]
+            if span > 0:
+                area = sum(
+                    (v0 + v1) / 2 * (t1 - t0)
+                    for (t0, v0), (t1, v1) in zip(samples, samples[1:])
+                )
+                mean = area / span
+            else:
+                mean = values[0]
+            self.stats[reg] = WindowStats(
+                samples=len(samples),
+                minimum=min(values),
+                maximum=max(values),
+                mean=mean,
+                energy_wh=self._window_energy[reg],
+            )
+            self._window_energy[reg] = 0.0
+        self.published_wh = dict(self.energy_wh)
+        self._window_start = at
+        return True
+
+    def restore_energy(self, register: int, negative: bool, wh: float) -> None:
+        """Add a total restored after a restart (once per register and sign)."""
+        if register not in self.energy_wh or (register, negative) in self._restored:
+            return
+        self._restored.add((register, negative))
+        for totals in (self.energy_wh, self.published_wh):
+            positive_wh, negative_wh = totals[register]
+            if negative:
+                totals[register] = (positive_wh, negative_wh + wh)
+            else:
+                totals[register] = (positive_wh + wh, negative_wh)
@@ -1,12 +1,11 @@
 from __future__ import annotations
 
 from homeassistant.components.select import SelectEntity
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 
 from .const import DOMAIN
-from .sync_modbus import write_register_sync
+from .entity import ModbusRegisterEntity
 
 
 # Example dropdown options:
@@ -36,7 +35,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
     async_add_entities([entity])
 
 
-class ModbusSelectEntity(CoordinatorEntity, SelectEntity):
+class ModbusSelectEntity(ModbusRegisterEntity, SelectEntity):
     """Dropdown menu that writes mapped values to a Modbus register."""
 
     def __init__(
@@ -47,9 +46,8 @@ class ModbusSelectEntity(CoordinatorEntity, SelectEntity):
         register: int,
         options: dict[str, int],
     ):
-        super().__init__(coordinator)
+        super().__init__(coordinator, register)
         self.hass = hass
-        self._register = register
         self._options_map = options
 
         self._attr_options = list(options.keys())
@@ -59,8 +57,7 @@ class ModbusSelectEntity(CoordinatorEntity, SelectEntity):
     @property
     def current_option(self) -> str | None:
         """Return the dropdown option that matches the current register value."""
-        data = self.coordinator.data or {}
-        current_value = data.get(self._register)
+        current_value = self._current_value
 
         # Reverse lookup: find which label matches the current register value
         for label, value in self._options_map.items():
@@ -76,10 +73,5 @@ class ModbusSelectEntity(CoordinatorEntity, SelectEntity):
 
         value = self._options_map[option]
 
-        # Write synchronously in executor
-        await self.hass.async_add_executor_job(
-            write_register_sync, self._register, value
-        )
-
-        # Refresh coordinator so sensors update
-        await self.coordinator.async_request_refresh()
\ No newline at end of file
+        # Write over the coordinator's shared connection
+        await self.coordinator.async_write_register(self._register, value)
\ No newline at end of file
@@ -1,11 +1,77 @@
 # custom_components/xStorage-Hybrid-HASS-Integration/sensor.py
 from __future__ import annotations
 
-from homeassistant.components.sensor import SensorEntity
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from typing import Any, Callable
+
+from homeassistant.components.sensor import (
+    RestoreSensor,
+    SensorDeviceClass,
+    SensorEntity,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfEnergy
 from homeassistant.core import HomeAssistant
-from .const import DOMAIN, REGISTER_LIST
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from .const import DOMAIN, REG_S16, REGISTER_LIST, SAMPLE_WINDOW
+from .entity import ModbusRegisterEntity
+from .stats import PollStats
+
+
+def _ms(seconds: float | None) -> float | None:
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+# key -> (name, unit, state class, value from the coordinator's PollStats);
+# counters only ever grow (until a restart), timings are gauges
+DIAGNOSTIC_SENSORS: dict[
+    str, tuple[str, str | None, SensorStateClass, Callable[[PollStats], Any]]
+] = {
+    "poll_cycle_time": (
+        "Poll cycle time", "ms", SensorStateClass.MEASUREMENT,
+        lambda stats: _ms(stats.last_cycle.duration) if stats.last_cycle else None,
+    ),
+    "poll_cycle_p95": (
+        "Poll cycle time p95", "ms", SensorStateClass.MEASUREMENT,
+        lambda stats: _ms(stats.percentile(95)),
+    ),
+    "poll_requests": (
+        "Modbus requests", None, SensorStateClass.TOTAL_INCREASING,
+        lambda stats: stats.counters["requests"],
+    ),
+    "poll_errors": (
+        "Modbus errors", None, SensorStateClass.TOTAL_INCREASING,
+        lambda stats: stats.counters["errors"],
+    ),
+    "poll_failed_cycles": (
+        "Failed poll cycles", None, SensorStateClass.TOTAL_INCREASING,
+        lambda stats: stats.counters["failed_cycles"],
+    ),
+    "poll_retries": (
+        "Modbus retries", None, SensorStateClass.TOTAL_INCREASING,
+        lambda stats: stats.counters["retries"],
+    ),
+    "poll_reconnects": (
+        "Modbus reconnects", None, SensorStateClass.TOTAL_INCREASING,
+        lambda stats: stats.counters["reconnects"],
+    ),
+    "poll_stale_fallbacks": (
+        "Stale fallbacks", None, SensorStateClass.TOTAL_INCREASING,
+        lambda stats: stats.counters["stale_fallbacks"],
+    ),
+    "poll_breaker_trips": (
+        "Paused block reads", None, SensorStateClass.TOTAL_INCREASING,
+        lambda stats: stats.counters["breaker_trips"],
+    ),
+    "poll_deferred": (
+        "Deferred block reads", None, SensorStateClass.TOTAL_INCREASING,
+        lambda stats: stats.counters["deferred"],
+    ),
+    "poll_writes_skipped": (
+        "Skipped writes", None, SensorStateClass.TOTAL_INCREASING,
+        lambda stats: stats.counters["writes_skipped"],
+    ),
+}
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities):
@@ -20,24 +86,109 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_e
         spec = REGISTER_LIST.get(reg) or {"name": f"Register {reg}", "unit": None}
         entities.append(ModbusRegisterSensor(coordinator, entry.entry_id, reg, spec))
 
-    async_add_entities(entities, update_before_add=True)
+    # Trapezoid-integrated energy of the sampled power registers; signed ones
+    # (battery) get a second total for the negative direction
+    for reg in coordinator.sampler.registers:
+        spec = REGISTER_LIST[reg]
+        entities.append(ModbusEnergySensor(coordinator, entry.entry_id, reg, spec, False))
+        if spec.get("type") == REG_S16:
+            entities.append(ModbusEnergySensor(coordinator, entry.entry_id, reg, spec, True))
 
+    entities.extend(
+        ModbusDiagnosticSensor(coordinator, entry.entry_id, key)
+        for key in DIAGNOSTIC_SENSORS
+    )
 
-class ModbusRegisterSensor(CoordinatorEntity, SensorEntity):
+    # Values come from the restored snapshot or the coordinator; no per-entity poll
+    async_add_entities(entities)
+
+
+class ModbusRegisterSensor(ModbusRegisterEntity, SensorEntity):
     def __init__(self, coordinator, entry_id: str, register: int, spec: dict):
-        super().__init__(coordinator)
-        self._register = register
+        super().__init__(coordinator, register)
         self._attr_name = spec["name"]
         self._attr_unique_id = f"{entry_id}_reg_{register}"
-        self._attr_native_unit_of_measurement = spec.get("unit")
+        self._attr_native_unit_of_measurement = spec.get("unit") or None
+
+    @property
+    def native_value(self):
+        # published view of coordinator.data, after deadband filtering
+        return self._published_value
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        # min/max/mean of the samples behind this state (sampled registers only)
+        stats = self.coordinator.sampler.stats.get(self._register)
+        if stats is None:
+            return None
+        return {**stats.as_attributes(), "window_s": SAMPLE_WINDOW}
+
+
+class ModbusEnergySensor(ModbusRegisterEntity, RestoreSensor):
+    """Energy integrated from a sampled power register, updated once per window."""
+
+    _attr_device_class = SensorDeviceClass.ENERGY
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+
+    def __init__(
+        self, coordinator, entry_id: str, register: int, spec: dict, negative: bool
+    ):
+        super().__init__(coordinator, register)
+        self._negative = negative
+        suffix = "_negative" if negative else ""
+        self._attr_name = f"{spec['name']} energy" + (" (negative)" if negative else "")
+        self._attr_unique_id = f"{entry_id}_energy_{register}{suffix}"
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        # continue the total across restarts
+        last = await self.async_get_last_sensor_data()
+        if last is None or last.native_value is None:
+            return
+        try:
+            kwh = float(last.native_value)
+        except (TypeError, ValueError):
+            return
+        self.coordinator.sampler.restore_energy(self._register, self._negative, kwh * 1000)
+
+    @property
+    def native_value(self):
+        totals = self.coordinator.sampler.published_wh.get(self._register)
+        if totals is None:
+            return None
+        return round(totals[1 if self._negative else 0] / 1000, 3)
+
+
+class ModbusDiagnosticSensor(CoordinatorEntity, SensorEntity):
+    """Poll instrumentation (timings, counters); disabled until enabled by the user."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, coordinator, entry_id: str, key: str):
+        super().__init__(coordinator)
+        name, unit, state_class, self._value_fn = DIAGNOSTIC_SENSORS[key]
+        self._key = key
+        self._attr_name = name
+        self._attr_unique_id = f"{entry_id}_{key}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_state_class = state_class
 
     @property
     def native_value(self):
-        # coordinator.data is a dict {register: value}
-        data = self.coordinator.data or {}
-        return data.get(self._register)
+        return self._value_fn(self.coordinator.stats)
 
     @property
-    def available(self) -> bool:
-        # Reflects whether last coordinator update succeeded
-        return self.coordinator.last_update_success
\ No newline at end of file
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        if self._key != "poll_cycle_time" or self.coordinator.stats.last_cycle is None:
+            return None
+        # per-phase breakdown of the last cycle
+        cycle = self.coordinator.stats.last_cycle
+        return {
+            "connect_ms": _ms(cycle.connect),
+            "decode_ms": _ms(cycle.decode),
+            "dispatch_ms": _ms(cycle.dispatch),
+            "requests": {label: _ms(seconds) for label, seconds in cycle.requests},
+            "stale": cycle.stale,
+        }
@@ -0,0 +1,130 @@
+"""Preallocated register snapshot backing ModbusCoordinator.data.
+
+Raw words live in one `array('H')` covering the configured address span and
+decoded values in a fixed list, one slot per configured register. Both are
+allocated once per coordinator and overwritten in place by each block read, so
+a poll cycle creates no per-register dicts. Slots never move when the read
+plan changes; entities resolve theirs once and index the lists directly.
+Each slot also records when its value was last updated, so availability can
+follow each register's own freshness, and separately when the device last
+reported its raw word, so writes of a value it already holds can be skipped.
+
+The snapshot is also a read-only Mapping {register: value} over the registers
+read so far, so code written against the old dict still works.
+"""
+from __future__ import annotations
+
+from array import array
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from .codec import register_width
+from .planner import ReadBlock
+
+
+class RegisterSnapshot(Mapping[int, Any]):
+    """Raw words and decoded values of a fixed register set."""
+
+    def __init__(
+        self, registers: Iterable[int], specs: Mapping[int, Mapping[str, Any]]
+    ) -> None:
+        self.registers: Tuple[int, ...] = tuple(sorted(set(registers)))
+        # register -> slot in `values`
+        self.offsets: Dict[int, int] = {reg: i for i, reg in enumerate(self.registers)}
+        # decoded value per slot; None = never read
+        self.values: List[Any] = [None] * len(self.registers)
+        # monotonic time each slot was last read or written; 0 = never
+        self.updated_at = array("d", bytes(8 * len(self.registers)))
+        # monotonic time the slot's word was last read from the device; 0 =
+        # never, or overwritten since (restored or optimistic values)
+        self.read_at = array("d", bytes(8 * len(self.registers)))
+
+        self.base = self.registers[0] if self.registers else 0
+        end = max(
+            (reg + register_width(specs.get(reg)) for reg in self.registers),
+            default=self.base,
+        )
+        # raw word per address from `base`, gap words included
+        self.words = array("H", bytes(2 * (end - self.base)))
+        self._block_slots: Dict[ReadBlock, Tuple[int, ...]] = {}
+
+    def offset(self, register: int) -> Optional[int]:
+        return self.offsets.get(register)
+
+    def block_slots(self, block: ReadBlock) -> Tuple[int, ...]:
+        """Slots of a block's registers, in block order (cached per block)."""
+        slots = self._block_slots.get(block)
+        if slots is None:
+            slots = self._block_slots[block] = tuple(
+                self.offsets[reg] for reg in block.registers
+            )
+        return slots
+
+    def store_block(
+        self, block: ReadBlock, words: Sequence[int], decoded: Sequence[Any]
+    ) -> None:
+        """Overwrite one block's words and its registers' decoded values in place."""
+        start = block.start - self.base
+        self.words[start:start + block.count] = array("H", words[: block.count])
+        values, updated_at, now = self.values, self.updated_at, time.monotonic()
+        read_at = self.read_at
+        for slot, value in zip(self.block_slots(block), decoded):
+            values[slot] = value
+            updated_at[slot] = read_at[slot] = now
+
+    def set_word(self, register: int, word: int) -> None:
+        """Overwrite one word that did not come from a read (e.g. an optimistic write).
+
+        Registers without a slot (e.g. write-only controls outside the polled
+        span) are ignored: nothing reads their word back from the snapshot.
+        """
+        slot = self.offsets.get(register)
+        if slot is None:
+            return
+        self.words[register - self.base] = word
+        self.read_at[slot] = 0.0
+
+    def set_value(self, register: int, value: Any) -> None:
+        slot = self.offsets.get(register)
+        if slot is not None:
+            self.values[slot] = value
+            self.updated_at[slot] = time.monotonic()
+
+    def age(self, slot: int, now: float) -> Optional[float]:
+        """Seconds since the slot was last updated (None = never)."""
+        updated_at = self.updated_at[slot]
+        return None if not updated_at else now - updated_at
+
+    def word_age(self, register: int, now: float) -> Optional[float]:
+        """Seconds since the device reported the register's word (None = unknown)."""
+        slot = self.offsets.get(register)
+        if slot is None or not self.read_at[slot]:
+            return None
+        return now - self.read_at[slot]
+
+    def word(self, register: int) -> int:
+        return self.words[register - self.base]
+
+    # Mapping view: {register: decoded value} for registers read so far
+
+    def __getitem__(self, register: int) -> Any:
+        slot = self.offsets.get(register)
+        value = None if slot is None else self.values[slot]
+        if value is None:
+            raise KeyError(register)
+        return value
+
+    def get(self, register: int, default: Any = None) -> Any:
+        slot = self.offsets.get(register)
+        value = None if slot is None else self.values[slot]
+        return default if value is None else value
+
+    def __contains__(self, register: object) -> bool:
+        slot = self.offsets.get(register)  # type: ignore[arg-type]
+        return slot is not None and self.values[slot] is not None
+
+    def __iter__(self) -> Iterator[int]:
+        return (reg for reg, value in zip(self.registers, self.values) if value is not None)
+
+    def __len__(self) -> int:
+        return sum(value is not None for value in self.values)
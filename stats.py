@@ -0,0 +1,122 @@
+"""Poll-cycle instrumentation for the Modbus coordinator.
+
+Keeps the last few cycles' phase timings in a ring buffer, latency histograms
+per read block and running error/retry/fallback counters. Exposed through the
+diagnostic sensors and the config entry diagnostics dump.
+"""
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import asdict, dataclass, field
+import time
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+# Cycles kept in the ring buffer
+HISTORY_SIZE = 100
+
+# Upper bounds (seconds) of the per-block latency histogram buckets
+LATENCY_BUCKETS: Tuple[float, ...] = (0.05, 0.1, 0.2, 0.5, 1.0, 2.0, float("inf"))
+
+
+@dataclass
+class CycleRecord:
+    """Timings of one poll cycle, in seconds."""
+
+    started: float
+    duration: float = 0.0
+    connect: float = 0.0
+    decode: float = 0.0
+    dispatch: float = 0.0
+    requests: List[Tuple[str, float]] = field(default_factory=list)
+    ok: bool = True
+    stale: bool = False
+
+
+class PollStats:
+    """Counters and timings collected by ModbusCoordinator."""
+
+    def __init__(self, history: int = HISTORY_SIZE) -> None:
+        self.cycles: Deque[CycleRecord] = deque(maxlen=history)
+        self.block_histograms: Dict[str, List[int]] = {}
+        self.counters: Dict[str, int] = {
+            "cycles": 0,
+            "requests": 0,
+            "errors": 0,  # failed block reads and writes
+            "failed_cycles": 0,
+            "retries": 0,
+            "reconnects": 0,
+            "stale_fallbacks": 0,
+            "breaker_trips": 0,
+            "deferred": 0,
+            "writes_skipped": 0,
+        }
+        self._current: Optional[CycleRecord] = None
+        self._started = 0.0
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def start_cycle(self) -> None:
+        self._started = time.perf_counter()
+        self._current = CycleRecord(started=time.time())
+
+    def add_phase(self, phase: str, seconds: float) -> None:
+        """Accumulate time spent in the "connect" or "decode" phase."""
+        if self._current is not None:
+            setattr(self._current, phase, getattr(self._current, phase) + seconds)
+
+    def add_request(self, label: str, seconds: float) -> None:
+        """Record one Modbus request (label e.g. "3063+17")."""
+        self.count("requests")
+        if self._current is not None:
+            self._current.requests.append((label, seconds))
+        buckets = self.block_histograms.setdefault(label, [0] * len(LATENCY_BUCKETS))
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                buckets[i] += 1
+                break
+
+    def mark_stale(self) -> None:
+        """The current cycle published last-known values for some registers."""
+        if self._current is not None:
+            self._current.stale = True
+
+    def end_cycle(self, ok: bool = True) -> None:
+        current, self._current = self._current, None
+        if current is None:
+            return
+        current.duration = time.perf_counter() - self._started
+        current.ok = ok
+        self.count("cycles")
+        if not ok:
+            self.count("failed_cycles")
+        if current.stale:
+            self.count("stale_fallbacks")
+        self.cycles.append(current)
+
+    def record_dispatch(self, seconds: float) -> None:
+        """Dispatch runs after the cycle closed; attribute it to the last one."""
+        if self.cycles:
+            self.cycles[-1].dispatch += seconds
+
+    @property
+    def last_cycle(self) -> Optional[CycleRecord]:
+        return self.cycles[-1] if self.cycles else None
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Cycle duration percentile over the ring buffer."""
+        durations = sorted(cycle.duration for cycle in self.cycles)
+        if not durations:
+            return None
+        index = int(round(pct / 100 * (len(durations) - 1)))
+        return durations[min(len(durations) - 1, index)]
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "counters": dict(self.counters),
+            "cycle_p50_s": self.percentile(50),
+            "cycle_p95_s": self.percentile(95),
+            "latency_buckets_s": [str(bound) for bound in LATENCY_BUCKETS],
+            "block_histograms": {label: list(b) for label, b in self.block_histograms.items()},
+            "cycles": [asdict(cycle) for cycle in self.cycles],
+        }
@@ -0,0 +1,277 @@
+"""Poll- and write-path benchmarks against the local simulator.
+
+Runs ModbusCoordinator against tools/xstorage_sim.py at a configurable RTT and
+reports, per register-map size:
+
+- cycle latency p50/p95
+- Modbus requests per cycle
+- bytes on the wire per cycle
+- coordinator CPU time per cycle
+
+It also times the number/select/button write paths. Results are checked against
+tools/bench_baseline.json: request and byte counts are exact budgets, latency
+budgets are expressed in RTTs so they hold on any machine. Exit code 1 on a
+regression.
+
+    python tools/bench_poll.py --rtt 0.05 --cycles 20
+    python tools/bench_poll.py --update-baseline
+
+Needs the integration's runtime (homeassistant, pymodbus) installed.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import importlib.util
+import json
+import re
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from xstorage_sim import SimConfig, XStorageSimulator  # noqa: E402
+
+BASELINE = Path(__file__).resolve().parent / "bench_baseline.json"
+PACKAGE = "xstorage_hybrid_bench"
+
+# Latency may exceed the RTT budget by this fraction before it counts as a regression
+LATENCY_TOLERANCE = 0.25
+
+# In-flight window of the pipelined poll scenario
+PIPELINE_WINDOW = 4
+
+
+def load_integration():
+    """Import the integration directory as a package, whatever its folder name."""
+    spec = importlib.util.spec_from_file_location(
+        PACKAGE, ROOT / "__init__.py", submodule_search_locations=[str(ROOT)]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[PACKAGE] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def full_register_map(const) -> Dict[int, dict]:
+    """REGISTER_LIST plus every commented-out entry in const.py."""
+    entries = dict(const.REGISTER_LIST)
+    pattern = re.compile(r"^\s*#+\s*(\d{4}): (\{.*\}),")
+    for line in (ROOT / "const.py").read_text(encoding="utf-8").splitlines():
+        match = pattern.match(line)
+        if match:
+            entries.setdefault(int(match.group(1)), eval(match.group(2), vars(const)))  # noqa: S307
+    return entries
+
+
+class SimThread:
+    """Simulator on its own thread and loop, so its CPU time is not ours."""
+
+    def __init__(self, config: SimConfig) -> None:
+        self.sim = XStorageSimulator(port=0, config=config)
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+
+    def __enter__(self) -> XStorageSimulator:
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self.sim.start(), self.loop).result()
+        return self.sim
+
+    def __exit__(self, *exc) -> None:
+        asyncio.run_coroutine_threadsafe(self.sim.stop(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+
+
+def _percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _summary(
+    latencies: List[float], cpu: List[float], requests: int, nbytes: int, runs: int
+) -> Dict[str, Any]:
+    return {
+        "p50_s": round(statistics.median(latencies), 4),
+        "p95_s": round(_percentile(latencies, 95), 4),
+        "requests": requests / runs,
+        "bytes": nbytes / runs,
+        "cpu_ms": round(1000 * statistics.mean(cpu), 3),
+    }
+
+
+async def bench_poll(
+    hass, coordinator_mod, sim, registers: List[int], cycles: int, max_in_flight: int = 1
+) -> Dict[str, Any]:
+    coordinator = coordinator_mod.ModbusCoordinator(
+        hass=hass, host=sim.host, port=sim.port, unit_id=1, registers=registers,
+        interval_seconds=30, max_in_flight=max_in_flight,
+    )
+    try:
+        await coordinator.async_poll_once()  # warm up: connect + static tier
+        latencies: List[float] = []
+        cpu: List[float] = []
+        sim.stats.reset()
+        for _ in range(cycles):
+            # force a full poll: every tier due
+            coordinator.mark_tiers_due()
+            start, start_cpu = time.perf_counter(), time.thread_time()
+            await coordinator.async_poll_once()
+            cpu.append(time.thread_time() - start_cpu)
+            latencies.append(time.perf_counter() - start)
+        return _summary(
+            latencies, cpu, sim.stats.requests, sim.stats.bytes_in + sim.stats.bytes_out, cycles
+        )
+    finally:
+        await coordinator.async_close()
+
+
+async def bench_write(
+    hass, coordinator_mod, sim, registers: List[int], steps, cycles: int, force: bool = True
+) -> Dict[str, Any]:
+    """Time a write sequence; unforced, after one warm-up press (steady-state repeats).
+
+    The coordinator holds a real register map, so optimistic updates hit both
+    polled registers (3078/3079) and write-only ones outside the span (3044/3086).
+    """
+    coordinator = coordinator_mod.ModbusCoordinator(
+        hass=hass, host=sim.host, port=sim.port, unit_id=1, registers=registers,
+        force_writes=force,
+    )
+    try:
+        await coordinator.hub.async_client()
+        if not force:
+            await coordinator.async_write_registers(steps)
+        latencies: List[float] = []
+        cpu: List[float] = []
+        sim.stats.reset()
+        for _ in range(cycles):
+            start, start_cpu = time.perf_counter(), time.thread_time()
+            await coordinator.async_write_registers(steps)
+            cpu.append(time.thread_time() - start_cpu)
+            latencies.append(time.perf_counter() - start)
+        return _summary(
+            latencies, cpu, sim.stats.requests, sim.stats.bytes_in + sim.stats.bytes_out, cycles
+        )
+    finally:
+        await coordinator.async_close()
+
+
+async def run(args) -> Dict[str, Dict[str, Any]]:
+    from homeassistant.core import HomeAssistant
+
+    load_integration()
+    const = importlib.import_module(f"{PACKAGE}.const")
+    coordinator_mod = importlib.import_module(f"{PACKAGE}.coordinator")
+    button = importlib.import_module(f"{PACKAGE}.button")
+
+    hass = HomeAssistant(tempfile.mkdtemp())
+    full = full_register_map(const)
+    today = sorted(const.REGISTER_LIST)
+    maps = {
+        "poll_today": today,
+        "poll_half": sorted(full)[: len(full) // 2],
+        "poll_full": sorted(full),
+    }
+    # the coordinator takes register specs from REGISTER_LIST
+    const.REGISTER_LIST.update(full)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    # pipelining only changes timing for clients that overlap requests
+    config = SimConfig(latency=args.rtt, single_session=False, pipelining=True, seed=1)
+    with SimThread(config) as sim:
+        for name, registers in maps.items():
+            results[name] = await bench_poll(hass, coordinator_mod, sim, registers, args.cycles)
+        results["poll_full_pipelined"] = await bench_poll(
+            hass, coordinator_mod, sim, maps["poll_full"], args.cycles,
+            max_in_flight=PIPELINE_WINDOW,
+        )
+        writes = {
+            "write_number": [(3078, 80)],
+            "write_select": [(3044, 50)],
+            **{f"write_button_{key}": steps for key, (_, steps) in button.ACTIONS.items()},
+        }
+        for name, steps in writes.items():
+            results[name] = await bench_write(
+                hass, coordinator_mod, sim, today, steps, args.cycles
+            )
+        # repeated presses of an already-applied action stay off the bus
+        results["write_button_repeat"] = await bench_write(
+            hass, coordinator_mod, sim, today, button.ACTIONS["force_discharge"][1],
+            args.cycles, force=False,
+        )
+
+    return results
+
+
+def check(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any], rtt: float) -> List[str]:
+    failures: List[str] = []
+    for name, budget in baseline.get("scenarios", {}).items():
+        result = results.get(name)
+        if result is None:
+            failures.append(f"{name}: missing from results")
+            continue
+        if result["requests"] > budget["requests"]:
+            failures.append(f"{name}: {result['requests']} requests/cycle > {budget['requests']}")
+        if result["bytes"] > budget["bytes"]:
+            failures.append(f"{name}: {result['bytes']} bytes/cycle > {budget['bytes']}")
+        limit = (budget["rtts"] * rtt + budget.get("extra_s", 0.0)) * (1 + LATENCY_TOLERANCE)
+        if result["p95_s"] > limit:
+            failures.append(f"{name}: p95 {result['p95_s']:.3f}s > {limit:.3f}s")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rtt", type=float, default=0.05, help="simulated round trip (s)")
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument(
+        "--update-baseline", action="store_true",
+        help="store measured request/byte counts and RTT multiples as the new budgets",
+    )
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    print(f"{'scenario':<30}{'p50 s':>9}{'p95 s':>9}{'req':>7}{'bytes':>9}{'cpu ms':>9}")
+    for name, r in results.items():
+        print(
+            f"{name:<30}{r['p50_s']:>9.3f}{r['p95_s']:>9.3f}{r['requests']:>7.1f}"
+            f"{r['bytes']:>9.0f}{r['cpu_ms']:>9.2f}"
+        )
+
+    if args.update_baseline:
+        previous = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+        scenarios = previous.get("scenarios", {})
+        for name, r in results.items():
+            extra = scenarios.get(name, {}).get("extra_s", 0.0)
+            scenarios[name] = {
+                "requests": r["requests"],
+                "bytes": r["bytes"],
+                "rtts": round(max(r["p95_s"] - extra, 0.0) / args.rtt, 1),
+                "extra_s": extra,
+            }
+        args.baseline.write_text(json.dumps({"scenarios": scenarios}, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print("No baseline; run with --update-baseline to create one")
+        return 0
+
+    failures = check(results, json.loads(args.baseline.read_text()), args.rtt)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
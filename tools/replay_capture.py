@@ -0,0 +1,202 @@
+"""Replay a recorded Modbus traffic capture through ModbusCoordinator.
+
+Captures come from the integration's "record traffic" option
+(<config>/xstorage_hybrid_<host>_<port>.jsonl, see recorder.py). The real
+coordinator and hub run against the recorded answers, including timeouts,
+exception responses, short reads and failed reconnects, so field behaviour
+can be profiled and regression-tested offline:
+
+- a poll cycle runs for every tier with recorded answers left
+- recorded write sequences (consecutive writes, e.g. one button press) are
+  re-issued (forced) as one call each, in capture order, between cycles
+
+With --realtime, answers take their recorded latency and cycles and writes
+start at their recorded offsets; otherwise the replay runs at full speed. Both
+modes are deterministic. Reports cycle latency, CPU time and the
+coordinator's counters; exit code 1 when requests found no recorded answer.
+
+    python tools/replay_capture.py capture.jsonl
+    python tools/replay_capture.py capture.jsonl --realtime --unit 2
+
+Needs the integration's runtime (homeassistant, pymodbus) installed.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bench_poll import PACKAGE, _percentile, load_integration  # noqa: E402
+
+
+def _capture_registers(records: List[Dict[str, Any]], unit: int, known) -> List[int]:
+    """Configured registers inside any span the capture read for `unit`."""
+    read: set = set()
+    for record in records:
+        if record.get("unit") == unit and record.get("op", "").startswith("read_"):
+            read.update(range(record["addr"], record["addr"] + record["count"]))
+    return sorted(reg for reg in known if reg in read)
+
+
+def _write_sequences(records: List[Dict[str, Any]], unit: int) -> List[List[Dict[str, Any]]]:
+    """Runs of consecutive write records for `unit`: one write call each."""
+    sequences: List[List[Dict[str, Any]]] = []
+    in_run = False
+    for record in records:
+        if record.get("unit") != unit:
+            continue
+        if record["op"] != "write":
+            in_run = False
+            continue
+        if in_run:
+            sequences[-1].append(record)
+        else:
+            sequences.append([record])
+            in_run = True
+    return sequences
+
+
+def _due_tiers(coordinator, transport, unit: int, op: str) -> Dict[str, float]:
+    """Tiers whose first block still has a recorded answer, with its capture time."""
+    due: Dict[str, float] = {}
+    for tier, blocks in coordinator.tier_blocks.items():
+        if not blocks:
+            continue
+        block = blocks[0]
+        answer = transport.peek(
+            {"op": op, "unit": unit, "addr": block.start, "count": block.count}
+        )
+        if answer is not None:
+            due[tier] = answer["t"]
+    return due
+
+
+async def _wait_until(offset: float, started: float) -> None:
+    delay = offset - (time.monotonic() - started)
+    if delay > 0:
+        await asyncio.sleep(delay)
+
+
+async def replay(args) -> int:
+    from homeassistant.core import HomeAssistant
+
+    load_integration()
+    const = importlib.import_module(f"{PACKAGE}.const")
+    coordinator_mod = importlib.import_module(f"{PACKAGE}.coordinator")
+    hub_mod = importlib.import_module(f"{PACKAGE}.hub")
+    recorder = importlib.import_module(f"{PACKAGE}.recorder")
+
+    records = recorder.load_capture(str(args.capture))
+    header = next((r for r in records if r.get("op") == "start"), {})
+    ops = [r["op"] for r in records if r.get("unit") == args.unit]
+    read_input = ops.count("read_input") >= ops.count("read_holding")
+    op = "read_input" if read_input else "read_holding"
+    writes = _write_sequences(records, args.unit)
+
+    transport = recorder.ReplayTransport(records, realtime=args.realtime)
+    hub = hub_mod.ModbusHub(header.get("host", "replay"), header.get("port", 502))
+    hub.client_factory = transport.client
+
+    hass = HomeAssistant(tempfile.mkdtemp())
+    coordinator = coordinator_mod.ModbusCoordinator(
+        hass=hass,
+        host=hub.host,
+        port=hub.port,
+        unit_id=args.unit,
+        registers=_capture_registers(records, args.unit, const.REGISTER_LIST),
+        interval_seconds=30,
+        read_input=read_input,
+        hub=hub,
+    )
+
+    latencies: List[float] = []
+    cpu: List[float] = []
+    started = time.monotonic()
+    try:
+        while args.max_cycles is None or len(latencies) < args.max_cycles:
+            due = _due_tiers(coordinator, transport, args.unit, op)
+            next_write: Optional[List[Dict[str, Any]]] = writes[0] if writes else None
+            if next_write is not None and (not due or next_write[0]["t"] <= min(due.values())):
+                writes.pop(0)
+                if args.realtime:
+                    await _wait_until(next_write[0]["t"], started)
+                steps = [
+                    (record["addr"] + i, value)
+                    for record in next_write
+                    for i, value in enumerate(record["values"])
+                ]
+                try:
+                    await coordinator.async_write_registers(steps, force=True)
+                except Exception as err:  # pylint: disable=broad-except
+                    print(f"write {steps} failed: {err}")
+                continue
+            if not due:
+                break
+            if args.realtime:
+                await _wait_until(min(due.values()), started)
+            coordinator.mark_tiers_due(due)
+            replayed = transport.replayed
+            cycle_start, cycle_cpu = time.perf_counter(), time.thread_time()
+            try:
+                await coordinator.async_poll_once()
+            except Exception as err:  # pylint: disable=broad-except
+                print(f"cycle {len(latencies) + 1} failed: {err}")
+            cpu.append(time.thread_time() - cycle_cpu)
+            latencies.append(time.perf_counter() - cycle_start)
+            if transport.replayed == replayed:
+                # nothing went out: reconnect backoff or open breakers
+                backoff = hub.reconnect_backoff
+                if not backoff:
+                    print("replay stalled (block breakers open); try --realtime")
+                    break
+                if args.realtime:
+                    await asyncio.sleep(backoff)
+                else:
+                    hub.skip_backoff()  # full speed: skip the backoff wait
+    finally:
+        await coordinator.async_close()
+
+    print(f"capture         {args.capture} ({len(records)} records)")
+    print(f"cycles          {len(latencies)}")
+    if latencies:
+        print(
+            f"cycle s         p50 {statistics.median(latencies):.3f}"
+            f"  p95 {_percentile(latencies, 95):.3f}  max {max(latencies):.3f}"
+        )
+        print(f"cpu ms          {1000 * statistics.mean(cpu):.2f} per cycle")
+    print(f"replayed        {transport.replayed} requests")
+    print(f"unanswered      {transport.mismatches}")
+    if transport.dropped:
+        print(
+            f"dropped         {transport.dropped} records lost while recording"
+            " (unanswered requests around them are expected)"
+        )
+    print(f"left over       {transport.remaining} (other units, address scans, ...)")
+    for name, value in coordinator.stats.counters.items():
+        print(f"{name:<16}{value}")
+    return 1 if transport.mismatches else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("capture", type=Path)
+    parser.add_argument("--unit", type=int, default=1, help="unit ID to replay")
+    parser.add_argument(
+        "--realtime", action="store_true",
+        help="keep the recorded latencies and request times instead of running flat out",
+    )
+    parser.add_argument("--max-cycles", type=int, default=None)
+    args = parser.parse_args()
+    return asyncio.run(replay(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,358 @@
+"""Local stand-in for the xStorage Hybrid Modbus TCP dongle.
+
+Serves the 3000-3320 register space with time-varying values, accepts writes
+to the control registers and emulates the WiFi dongle's quirks: request
+latency, a single TCP session, dropped connections and exception responses.
+
+    python tools/xstorage_sim.py --port 8899 --latency 0.05 --jitter 0.1
+
+Then point the integration (or tools/bench_poll.py) at 127.0.0.1:8899.
+No Home Assistant or pymodbus install is needed.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib.util
+import logging
+import math
+import random
+import struct
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+_LOGGER = logging.getLogger("xstorage_sim")
+
+
+def _load_const():
+    # const.py has no imports of its own, so it loads without Home Assistant
+    path = Path(__file__).resolve().parent.parent / "const.py"
+    spec = importlib.util.spec_from_file_location("xstorage_const", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+const = _load_const()
+
+ADDRESS_MIN = 3000
+ADDRESS_MAX = 3320
+
+# Registers the inverter accepts writes to, with their power-on values
+WRITABLE_DEFAULTS: Dict[int, int] = {3044: 0, 3078: 100, 3079: 100, 3086: 0}
+
+SERIAL_NUMBER = "XSH0000001"
+
+# Modbus exception codes
+EXC_ILLEGAL_FUNCTION = 0x01
+EXC_ILLEGAL_ADDRESS = 0x02
+EXC_ILLEGAL_VALUE = 0x03
+EXC_DEVICE_BUSY = 0x06
+
+MAX_READ_COUNT = 125
+MAX_WRITE_COUNT = 123
+
+
+@dataclass
+class SimStats:
+    """Counters for benchmarks; reset with `reset()`."""
+
+    requests: int = 0
+    reads: int = 0
+    writes: int = 0
+    exceptions: int = 0
+    drops: int = 0
+    refused: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+
+    def reset(self) -> None:
+        for name in self.__dataclass_fields__:
+            setattr(self, name, 0)
+
+
+@dataclass
+class SimConfig:
+    latency: float = 0.05           # base response delay (seconds)
+    jitter: float = 0.0             # extra uniform delay on top (seconds)
+    single_session: bool = True     # refuse a second TCP connection like the dongle
+    pipelining: bool = False        # answer overlapping requests concurrently
+    drop_rate: float = 0.0          # chance a request closes the socket unanswered
+    exception_rate: float = 0.0     # chance a request gets "device busy"
+    unit_id: Optional[int] = None   # only answer this unit (None = any)
+    invalid: Set[int] = field(default_factory=set)  # addresses answering Illegal Data Address
+    seed: Optional[int] = None
+
+
+class XStorageModel:
+    """Time-varying register values for a plausible PV + battery system."""
+
+    def __init__(self, rng: Optional[random.Random] = None) -> None:
+        # noise source; seeded by the simulator so runs are reproducible
+        self._rng = rng or random.Random()
+        self.holding: Dict[int, int] = dict(WRITABLE_DEFAULTS)
+        self._started = time.monotonic()
+        self._soc = 600.0  # 0.1 %
+        self._energy = 0.0  # Wh, shared counter base
+        self._last = self._started
+
+    def _advance(self) -> Dict[str, float]:
+        now = time.monotonic()
+        dt, self._last = now - self._last, now
+
+        # daylight curve from wall clock, with some cloud noise
+        local = time.localtime()
+        hours = local.tm_hour + local.tm_min / 60 + local.tm_sec / 3600
+        sun = max(0.0, math.sin(math.pi * (hours - 6) / 12))
+        pv1 = 2800 * sun * self._rng.uniform(0.9, 1.0)
+        pv2 = 1600 * sun * self._rng.uniform(0.9, 1.0)
+        load = 400 + 300 * abs(math.sin((now - self._started) / 90))
+
+        # battery covers the difference unless a force mode is active
+        mode = self.holding.get(3086, 0)
+        if mode == 1:
+            bat = 50 * self.holding.get(3079, 100)
+        elif mode == 2:
+            bat = -50 * self.holding.get(3078, 100)
+        else:
+            bat = pv1 + pv2 - load
+        bat = max(-5000.0, min(5000.0, bat))
+        if (self._soc >= 1000 and bat > 0) or (self._soc <= 100 and bat < 0):
+            bat = 0.0
+
+        self._soc = max(0.0, min(1000.0, self._soc + bat * dt / 3600 / 10))
+        self._energy += (pv1 + pv2) * dt / 3600
+        return {"pv1": pv1, "pv2": pv2, "bat": bat, "load": load}
+
+    def snapshot(self) -> Dict[int, int]:
+        """Raw 16-bit words for the whole address space."""
+        s = self._advance()
+        words: Dict[int, int] = {reg: 0 for reg in range(ADDRESS_MIN, ADDRESS_MAX + 1)}
+        lsb = lambda: self._rng.choice((-1, 0, 0, 1))  # noqa: E731 - one-LSB jitter
+
+        pv_volt = 3500 + lsb() if s["pv1"] else 0
+        words[3000] = pv_volt
+        words[3001] = pv_volt - 40 if s["pv2"] else 0
+        words[3013] = int(s["pv2"] / max(pv_volt / 10, 1) * 100) if pv_volt else 0
+        words[3024] = int(s["pv1"])
+        words[3025] = int(s["pv2"])
+
+        bat_volt = 5200 + lsb()
+        words[3063] = bat_volt
+        words[3064] = int(s["bat"] / (bat_volt / 100) * 10)
+        words[3065] = int(s["bat"])
+        words[3066] = int(self._soc)
+        words[3067] = 251 + lsb()
+        words.update({3068: 90, 3069: 560, 3070: 50, 3071: 50})
+
+        words[3045] = 1  # inverter model
+        words[3046] = 2  # SYS_STATE: running
+        words.update({3074: 100, 3077: 2})
+        words.update({3100: int(s["load"] - s["pv1"] - s["pv2"] + s["bat"])})
+        words.update({3144: int(s["load"])})
+
+        # monotonically increasing energy counters (U32 hi/lo and U16)
+        total = int(self._energy / 100)  # 0.1 kWh
+        words[3040], words[3041] = total >> 16 & 0xFFFF, total & 0xFFFF
+        words[3109] = total % 1000
+        words[3152] = total & 0xFFFF
+
+        for i, char in enumerate(SERIAL_NUMBER[:10]):
+            words[3229 + i] = ord(char)
+
+        local = time.localtime()
+        bcd = lambda v: int(str(v), 16)  # noqa: E731
+        words.update({
+            3239: bcd(local.tm_year % 100), 3240: bcd(local.tm_mon), 3241: bcd(local.tm_mday),
+            3242: bcd(local.tm_hour), 3243: bcd(local.tm_min), 3244: bcd(local.tm_sec),
+            3245: bcd(local.tm_wday + 1),
+        })
+
+        words.update(self.holding)
+        return {reg: value & 0xFFFF for reg, value in words.items()}
+
+
+class XStorageSimulator:
+    """Minimal Modbus TCP server (FC03/04/06/16) in front of XStorageModel."""
+
+    def __init__(
+        self, host: str = "127.0.0.1", port: int = 8899, config: Optional[SimConfig] = None
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.config = config or SimConfig()
+        # separate streams: value noise must not shift with the fault draws
+        self.model = XStorageModel(random.Random(self.config.seed))
+        self.stats = SimStats()
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._sessions = 0
+        self._writers: Set[asyncio.StreamWriter] = set()
+        self._rng = random.Random(self.config.seed)
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        sock = self._server.sockets[0].getsockname()
+        self.port = sock[1]
+        _LOGGER.info("xStorage simulator listening on %s:%s", self.host, self.port)
+
+    async def stop(self) -> None:
+        for writer in list(self._writers):
+            writer.close()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if self.config.single_session and self._sessions:
+            # the dongle accepts one client; later ones are closed at once
+            self.stats.refused += 1
+            writer.close()
+            return
+
+        self._sessions += 1
+        self._writers.add(writer)
+        inflight: Set[asyncio.Future] = set()
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(7)
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    return
+                tid, pid, length, unit = struct.unpack(">HHHB", header)
+                pdu = await reader.readexactly(length - 1)
+                self.stats.requests += 1
+                self.stats.bytes_in += 7 + len(pdu)
+
+                if self.config.pipelining:
+                    # each request gets its own latency; answers may overtake
+                    task = asyncio.ensure_future(self._respond(writer, tid, pid, unit, pdu))
+                    inflight.add(task)
+                    task.add_done_callback(inflight.discard)
+                elif not await self._respond(writer, tid, pid, unit, pdu):
+                    return
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            # cancelled on shutdown: end quietly rather than fail the handler task
+            return
+        finally:
+            for task in inflight:
+                task.cancel()
+            self._sessions -= 1
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _respond(
+        self, writer: asyncio.StreamWriter, tid: int, pid: int, unit: int, pdu: bytes
+    ) -> bool:
+        """Answer one request after the simulated latency; False if the link dropped."""
+        delay = self.config.latency + self._rng.uniform(0, self.config.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self._rng.random() < self.config.drop_rate:
+            self.stats.drops += 1
+            writer.close()
+            return False
+
+        if self.config.unit_id is not None and unit != self.config.unit_id:
+            return True  # wrong unit: the dongle stays silent
+
+        response = self._process(pdu)
+        frame = struct.pack(">HHHB", tid, pid, len(response) + 1, unit) + response
+        self.stats.bytes_out += len(frame)
+        writer.write(frame)
+        await writer.drain()
+        return True
+
+    def _exception(self, function: int, code: int) -> bytes:
+        self.stats.exceptions += 1
+        return struct.pack(">BB", function | 0x80, code)
+
+    def _process(self, pdu: bytes) -> bytes:
+        function = pdu[0]
+        if self._rng.random() < self.config.exception_rate:
+            return self._exception(function, EXC_DEVICE_BUSY)
+
+        if function in (0x03, 0x04):
+            address, count = struct.unpack(">HH", pdu[1:5])
+            if not 1 <= count <= MAX_READ_COUNT:
+                return self._exception(function, EXC_ILLEGAL_VALUE)
+            span = range(address, address + count)
+            out_of_range = span[0] < ADDRESS_MIN or span[-1] > ADDRESS_MAX
+            if out_of_range or self.config.invalid.intersection(span):
+                return self._exception(function, EXC_ILLEGAL_ADDRESS)
+            self.stats.reads += 1
+            words = self.model.snapshot()
+            payload = struct.pack(f">{count}H", *(words[reg] for reg in span))
+            return struct.pack(">BB", function, len(payload)) + payload
+
+        if function == 0x06:
+            address, value = struct.unpack(">HH", pdu[1:5])
+            if address not in WRITABLE_DEFAULTS:
+                return self._exception(function, EXC_ILLEGAL_ADDRESS)
+            self.stats.writes += 1
+            self.model.holding[address] = value
+            return pdu[:5]
+
+        if function == 0x10:
+            address, count, _ = struct.unpack(">HHB", pdu[1:6])
+            if not 1 <= count <= MAX_WRITE_COUNT:
+                return self._exception(function, EXC_ILLEGAL_VALUE)
+            if any(reg not in WRITABLE_DEFAULTS for reg in range(address, address + count)):
+                return self._exception(function, EXC_ILLEGAL_ADDRESS)
+            values = struct.unpack(f">{count}H", pdu[6:6 + 2 * count])
+            self.stats.writes += 1
+            self.model.holding.update(zip(range(address, address + count), values))
+            return pdu[:5]
+
+        return self._exception(function, EXC_ILLEGAL_FUNCTION)
+
+
+def _parse_addresses(text: str) -> Set[int]:
+    """"3050-3053,3076" -> {3050, 3051, 3052, 3053, 3076}"""
+    result: Set[int] = set()
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        lo, _, hi = part.partition("-")
+        result.update(range(int(lo), int(hi or lo) + 1))
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8899)
+    parser.add_argument("--latency", type=float, default=0.05, help="base response delay (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random delay (s)")
+    parser.add_argument("--multi-session", action="store_true", help="accept concurrent clients")
+    parser.add_argument("--pipelining", action="store_true", help="answer overlapping requests concurrently")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="chance to drop the connection")
+    parser.add_argument("--exception-rate", type=float, default=0.0, help="chance of a busy exception")
+    parser.add_argument("--unit-id", type=int, default=None)
+    parser.add_argument("--invalid", default="", help="illegal addresses, e.g. 3050-3053,3076")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    config = SimConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        single_session=not args.multi_session,
+        pipelining=args.pipelining,
+        drop_rate=args.drop_rate,
+        exception_rate=args.exception_rate,
+        unit_id=args.unit_id,
+        invalid=_parse_addresses(args.invalid),
+        seed=args.seed,
+    )
+    asyncio.run(XStorageSimulator(args.host, args.port, config).serve_forever())
+
+
+if __name__ == "__main__":
+    main()